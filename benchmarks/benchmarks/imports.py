@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+SCRIPT = '''
+import time
+start = time.perf_counter()
+import pyphi
+print(time.perf_counter() - start)
+'''
+
+
+class BenchmarkImport:
+
+    number = 1
+    repeat = 5
+
+    def track_import_pyphi(self):
+        # Import in a fresh interpreter, as a worker process would.
+        output = subprocess.check_output([sys.executable, '-c', SCRIPT])
+        return float(output)
+
+    track_import_pyphi.unit = 'seconds'
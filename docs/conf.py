@@ -170,6 +170,7 @@ rst_prolog = """
 .. |models.big_phi| replace:: :mod:`~pyphi.models.big_phi`
 .. |models.concept| replace:: :mod:`~pyphi.models.concept`
 .. |models.cuts| replace:: :mod:`~pyphi.models.cuts`
+.. |models.repertoire| replace:: :mod:`~pyphi.models.repertoire`
 .. |network| replace:: :mod:`~pyphi.network`
 .. |subsystem| replace:: :mod:`~pyphi.subsystem`
 .. |macro| replace:: :mod:`~pyphi.macro`
@@ -190,6 +191,7 @@ rst_prolog = """
 .. |Constellation| replace:: :class:`~pyphi.models.concept.Constellation`
 .. |Cut| replace:: :class:`~pyphi.models.cuts.Cut`
 .. |Bipartition| replace:: :class:`~pyphi.models.cuts.Bipartition`
+.. |FactoredRepertoire| replace:: :class:`~pyphi.models.repertoire.FactoredRepertoire`
 .. |Mip| replace:: :class:`~pyphi.models.concept.Mip`
 .. |Mice| replace:: :class:`~pyphi.models.concept.Mice`
 .. |Node| replace:: :class:`~pyphi.node.Node`
@@ -68,42 +68,16 @@ __all__ = ['Network', 'Subsystem', 'config', 'constants', 'convert', 'db',
            'subsystem', 'utils', 'validate']
 
 import logging
-import logging.config
-
-
-# Configure logging module.
-logging.config.dictConfig({
-    'version': 1,
-    'disable_existing_loggers': False,
-    'formatters': {
-        'standard': {
-            'format': config.LOGGING_CONFIG['format']
-        }
-    },
-    'handlers': {
-        'file': {
-            'level': config.LOGGING_CONFIG['file']['level'],
-            'class': 'logging.FileHandler',
-            'filename': config.LOGGING_CONFIG['file']['filename'],
-            'formatter': 'standard',
-        },
-        'stdout': {
-            'level': config.LOGGING_CONFIG['stdout']['level'],
-            'class': 'logging.StreamHandler',
-            'formatter': 'standard',
-        }
-    },
-    'root': {
-        'level': 'DEBUG',
-        'handlers': [h for h in ['file', 'stdout'] if
-                     config.LOGGING_CONFIG[h]['enabled']]
-    }
-})
 
 log = logging.getLogger(__name__)
 
+# Logging is only configured on request, so that importing PyPhi does not
+# create log files or change the root logger.
+if config.CONFIGURE_LOGGING_ON_IMPORT:
+    config.configure_logging()
+
 # Log the currently loaded version and configuration.
-if config.LOG_CONFIG_ON_IMPORT:
+if config.LOG_CONFIG_ON_IMPORT and log.isEnabledFor(logging.INFO):
     log.info('PyPhi version {}'.format(__version__))
     if config.file_loaded:
         log.info('Loaded configuration from '
@@ -6,23 +6,71 @@
 A memory-limited cache decorator.
 """
 
+import abc
+import atexit
+import io
 import os
 import pickle
+import shutil
+import sys
+import tempfile
+import weakref
+from collections import OrderedDict
 from functools import namedtuple, update_wrapper, wraps
 
-import psutil
-import redis
-
 from . import config, constants
 
 _CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "currsize"])
 
+# The total physical memory of the machine, once it has been looked up.
+_physical_memory = None
+
+
+def _memory_percent():
+    """Return the percentage of physical memory used by this process."""
+    # psutil is only imported once memory usage is checked.
+    import psutil
+
+    return psutil.Process(os.getpid()).memory_percent()
+
 
 def memory_full():
     """Check if the memory is too full for further caching."""
-    current_process = psutil.Process(os.getpid())
-    return (current_process.memory_percent() >
-            config.MAXIMUM_CACHE_MEMORY_PERCENTAGE)
+    return _memory_percent() > config.MAXIMUM_CACHE_MEMORY_PERCENTAGE
+
+
+def percentage_to_bytes(percentage):
+    """Return the number of bytes in a percentage of physical memory."""
+    global _physical_memory
+    if _physical_memory is None:
+        import psutil
+
+        _physical_memory = psutil.virtual_memory().total
+    return int(_physical_memory * percentage / 100)
+
+
+def cache_budget():
+    """Return the maximum number of bytes that the in-memory caches of this
+    process may hold together.
+
+    This is ``config.MAXIMUM_CACHE_BYTES`` if it is set, and
+    ``config.MAXIMUM_CACHE_MEMORY_PERCENTAGE`` of physical memory otherwise.
+    """
+    if config.MAXIMUM_CACHE_BYTES is not None:
+        return config.MAXIMUM_CACHE_BYTES
+    return percentage_to_bytes(config.MAXIMUM_CACHE_MEMORY_PERCENTAGE)
+
+
+def sizeof(value):
+    """Return the number of bytes used by a cached value.
+
+    Arrays, repertoires and |Mice| include their array data (see their
+    ``__sizeof__`` methods), and tuples and lists include their items.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, (tuple, list)):
+        size += sum(sizeof(item) for item in value)
+    return size
 
 
 class _HashedSeq(list):
@@ -74,7 +122,9 @@ def cache(cache={}, maxmem=config.MAXIMUM_CACHE_MEMORY_PERCENTAGE,
     """Memory-limited cache decorator.
 
     *maxmem* is a float between 0 and 100, inclusive, specifying the maximum
-    percentage of physical memory that the cache can use.
+    percentage of physical memory that the cache can use. The size of the
+    cached results is tracked as they are stored, and the oldest results are
+    evicted to make room for new ones.
 
     If *typed* is True, arguments of different types will be cached separately.
     For example, f(3.0) and f(3) will be treated as distinct calls with
@@ -93,9 +143,12 @@ def cache(cache={}, maxmem=config.MAXIMUM_CACHE_MEMORY_PERCENTAGE,
     make_key = _make_key
 
     def decorating_function(user_function, hits=0, misses=0):
-        full = False
         # Bound method to look up a key or return None.
         cache_get = cache.get
+        # The size of each result cached under a memory limit, in insertion
+        # order, and their total.
+        sizes = OrderedDict()
+        nbytes = 0
 
         if not maxmem:
 
@@ -116,19 +169,24 @@ def cache(cache={}, maxmem=config.MAXIMUM_CACHE_MEMORY_PERCENTAGE,
 
             def wrapper(*args, **kwds):
                 # Memory-limited caching.
-                nonlocal hits, misses, full
+                nonlocal hits, misses, nbytes
                 key = make_key(args, kwds, typed)
                 result = cache_get(key)
                 if result is not None:
                     hits += 1
                     return result
                 result = user_function(*args, **kwds)
-                if not full:
+                size = sizeof(result)
+                budget = percentage_to_bytes(maxmem)
+                if size <= budget:
+                    # Evict the oldest results until the new one fits.
+                    while sizes and nbytes + size > budget:
+                        old_key, old_size = sizes.popitem(last=False)
+                        cache.pop(old_key, None)
+                        nbytes -= old_size
                     cache[key] = result
-                    # Cache is full if the total recursive usage is greater
-                    # than the maximum allowed percentage.
-                    current_process = psutil.Process(os.getpid())
-                    full = current_process.memory_percent() > maxmem
+                    sizes[key] = size
+                    nbytes += size
                 misses += 1
                 return result
 
@@ -138,10 +196,10 @@ def cache(cache={}, maxmem=config.MAXIMUM_CACHE_MEMORY_PERCENTAGE,
 
         def cache_clear():
             """Clear the cache and cache statistics."""
-            nonlocal hits, misses, full
+            nonlocal hits, misses, nbytes
             cache.clear()
-            hits = misses = 0
-            full = False
+            sizes.clear()
+            hits = misses = nbytes = 0
 
         wrapper.cache_info = cache_info
         wrapper.cache_clear = cache_clear
@@ -150,18 +208,92 @@ def cache(cache={}, maxmem=config.MAXIMUM_CACHE_MEMORY_PERCENTAGE,
     return decorating_function
 
 
+class _Ledger:
+    """The bytes held by all |DictCache| instances of this process.
+
+    The cached values of every cache are recorded in least recently used
+    order, so that a cache which needs room evicts the oldest values of any
+    cache, not only its own.
+    """
+    def __init__(self):
+        # Maps ``(id(cache), key)`` to a weak reference to the cache.
+        self.entries = OrderedDict()
+        self.nbytes = 0
+
+    def add(self, cache, key, size):
+        self.entries[(id(cache), key)] = cache._ref
+        self.nbytes += size
+
+    def touch(self, cache, key):
+        self.entries.move_to_end((id(cache), key))
+
+    def remove(self, cache, key, size):
+        del self.entries[(id(cache), key)]
+        self.nbytes -= size
+
+    def evict(self):
+        """Evict the least recently used value of all caches."""
+        (_, key), ref = next(iter(self.entries.items()))
+        ref()._discard(key)
+
+    def release(self, ident, sizes):
+        """Forget the values of a cache which has been garbage collected."""
+        for key, size in sizes.items():
+            del self.entries[(ident, key)]
+            self.nbytes -= size
+
+
+_ledger = _Ledger()
+
+
 class DictCache():
     """A generic dictionary-based cache.
 
     Intended to be used as an object-level cache of method results.
+
+    All the caches of a process together hold at most :func:`cache_budget`
+    bytes, as measured by :func:`sizeof`. When a new value does not fit, the
+    least recently used values of all caches are evicted.
+
+    Attributes:
+        nbytes (int): The number of bytes used by the cached values.
     """
     def __init__(self):
-        self.cache = {}
+        self.cache = OrderedDict()
+        self._sizes = {}
+        self.nbytes = 0
         self.hits = 0
         self.misses = 0
+        self._register()
+
+    def _register(self):
+        """Release the values of this cache when it is garbage collected."""
+        self._ref = weakref.ref(self)
+        finalizer = weakref.finalize(self, _ledger.release, id(self),
+                                     self._sizes)
+        finalizer.atexit = False
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_ref']
+        return state
+
+    def __setstate__(self, state):
+        # Record the unpickled values in the budget of this process.
+        cache, sizes = state['cache'], state['_sizes']
+        self.__dict__.update(state)
+        self.cache = OrderedDict()
+        self._sizes = {}
+        self.nbytes = 0
+        self._register()
+        for key, value in cache.items():
+            self._store(key, value, sizes[key])
 
     def clear(self):
-        self.cache = {}
+        _ledger.release(id(self), self._sizes)
+        self.cache.clear()
+        self._sizes.clear()
+        self.nbytes = 0
         self.hits = 0
         self.misses = 0
 
@@ -181,13 +313,38 @@ class DictCache():
         """
         if key in self.cache:
             self.hits += 1
+            self.cache.move_to_end(key)
+            _ledger.touch(self, key)
             return self.cache[key]
         self.misses += 1
         return None
 
     def set(self, key, value):
-        """Set a value in the cache"""
+        """Set a value in the cache.
+
+        Values larger than the whole budget are not cached.
+        """
+        self._store(key, value, sizeof(value))
+
+    def _store(self, key, value, size):
+        self._discard(key)
+        budget = cache_budget()
+        if size > budget:
+            return
+        # Evict the least recently used values until the new one fits.
+        while _ledger.entries and _ledger.nbytes + size > budget:
+            _ledger.evict()
         self.cache[key] = value
+        self._sizes[key] = size
+        self.nbytes += size
+        _ledger.add(self, key, size)
+
+    def _discard(self, key):
+        if key in self.cache:
+            del self.cache[key]
+            size = self._sizes.pop(key)
+            self.nbytes -= size
+            _ledger.remove(self, key, size)
 
     # TODO: handle **kwarg keys if needed
     # See joblib.func_inspect.filter_args
@@ -218,6 +375,8 @@ class RedisConn:
 
     def __init__(self):
         if RedisConn.instance is None:
+            import redis
+
             conn = redis.StrictRedis(host=config.REDIS_CONFIG['host'],
                                      port=config.REDIS_CONFIG['port'],
                                      db=0)
@@ -293,17 +452,21 @@ class RedisMiceCache(RedisCache):
     """
     def __init__(self, subsystem, parent_cache=None):
         super().__init__()
+        # Imported here to avoid a circular import.
+        from .utils import digest
+
         self.subsystem = subsystem
-        self.subsystem_hash = hash(subsystem)
+        # Results depend on the configuration as well as the subsystem.
+        self.subsystem_digest = digest((subsystem, config.result_options()))
 
         if parent_cache is not None:
             validate_parent_cache(parent_cache)
-            # Store the hash of the parent subsystem. We don't want to store the
-            # parent subsystem explicitly so that it does not need to be passed
-            # between processes.
-            self.parent_subsystem_hash = parent_cache.subsystem_hash
+            # Store the digest of the parent subsystem. We don't want to store
+            # the parent subsystem explicitly so that it does not need to be
+            # passed between processes.
+            self.parent_subsystem_digest = parent_cache.subsystem_digest
         else:
-            self.parent_subsystem_hash = None
+            self.parent_subsystem_digest = None
 
     # TODO: if the value is found in the parent cache, store it in this
     # cache so we don't have to call `damaged_by_cut` over and over?
@@ -319,9 +482,9 @@ class RedisMiceCache(RedisCache):
             return mice
 
         # Try and get the key from the parent cache.
-        if self.parent_subsystem_hash:
-            parent_key = key.replace(str(self.subsystem_hash),
-                                     str(self.parent_subsystem_hash), 1)
+        if self.parent_subsystem_digest:
+            parent_key = key.replace(self.subsystem_digest,
+                                     self.parent_subsystem_digest, 1)
             mice = super().get(parent_key)
 
             if mice is not None and not mice.damaged_by_cut(self.subsystem):
@@ -340,7 +503,7 @@ class RedisMiceCache(RedisCache):
     def key(self, direction, mechanism, purviews=False, _prefix=None):
         """Cache key. This is the call signature of |find_mice|"""
         return "subsys:{}:{}:{}:{}:{}".format(
-            self.subsystem_hash, _prefix, direction, mechanism, purviews)
+            self.subsystem_digest, _prefix, direction, mechanism, purviews)
 
 
 class DictMiceCache(DictCache):
@@ -363,9 +526,12 @@ class DictMiceCache(DictCache):
         A Mice is affected if either the cut splits the mechanism
         or splits the connections between the purview and mechanism
         """
-        for key, mice in parent_cache.cache.items():
+        # Storing a Mice may evict values of the parent, so copy its items.
+        items = [(key, mice, parent_cache._sizes[key])
+                 for key, mice in parent_cache.cache.items()]
+        for key, mice, size in items:
             if not mice.damaged_by_cut(self.subsystem):
-                self.cache[key] = mice
+                self._store(key, mice, size)
 
     def set(self, key, mice):
         """Set a value in the cache.
@@ -379,21 +545,298 @@ class DictMiceCache(DictCache):
             incredibly inefficient because the caches have to be passed
             between process. This will be changed once global caches are
             implemented.
-          - Memory is not too full.
+
+        The least recently used |Mice| are evicted if the cache is full.
         """
-        if (not self.subsystem.is_cut and mice.phi > 0
-                and not memory_full()):
-            self.cache[key] = mice
+        if not self.subsystem.is_cut and mice.phi > 0:
+            super().set(key, mice)
 
     def key(self, direction, mechanism, purviews=False, _prefix=None):
         """Cache key. This is the call signature of |find_mice|"""
         return (_prefix, direction, mechanism, purviews)
 
 
+# The directory of the shared |Mice| cache of this process, once created.
+_shared_directory = None
+
+
+def shared_mice_directory():
+    """Return the directory of the |Mice| cache shared by the main process and
+    its workers.
+
+    The directory is named after the main process, so that the workers of
+    :mod:`pyphi.compute.parallel` find it without being told, and it is
+    deleted when the main process exits.
+    """
+    global _shared_directory
+    if _shared_directory is None:
+        # Imported here to avoid a circular import.
+        from .compute import parallel
+
+        pid = os.getppid() if parallel.in_worker() else os.getpid()
+        _shared_directory = os.path.join(tempfile.gettempdir(),
+                                         'pyphi-mice-{}'.format(pid))
+        os.makedirs(_shared_directory, exist_ok=True)
+        if not parallel.in_worker():
+            atexit.register(shutil.rmtree, _shared_directory,
+                            ignore_errors=True)
+    return _shared_directory
+
+
+class _MicePickler(pickle.Pickler):
+    """Pickles references to the subsystem of a cache by name, rather than
+    the whole subsystem and its caches."""
+
+    def __init__(self, file, subsystem):
+        super().__init__(file, protocol=constants.PICKLE_PROTOCOL)
+        self.subsystem = subsystem
+
+    def persistent_id(self, obj):
+        if obj is self.subsystem:
+            return 'subsystem'
+        return None
+
+
+class _MiceUnpickler(pickle.Unpickler):
+    """Unpickles references pickled by :class:`_MicePickler` as the subsystem
+    of the reading cache."""
+
+    def __init__(self, file, subsystem):
+        super().__init__(file)
+        self.subsystem = subsystem
+
+    def persistent_load(self, pid):
+        if pid == 'subsystem':
+            return self.subsystem
+        raise pickle.UnpicklingError('Unknown persistent id {}'.format(pid))
+
+
+class _StoredMiceCache(DictMiceCache, metaclass=abc.ABCMeta):
+    """A subsystem-local cache for |Mice| objects, backed by a store which is
+    shared with other processes.
+
+    |Mice| are kept in the local cache as in :class:`DictMiceCache`, and are
+    also saved to the store under a key which does not depend on the process.
+    Subclasses implement :meth:`_load` and :meth:`_save`.
+
+    Unlike the local cache, the |Mice| of cut subsystems are stored as well.
+    A |Mice| only depends on the connections severed by the cut that lead
+    into the mechanism (for causes) or out of it (for effects), so these,
+    rather than the whole cut, are part of its key. It is then shared by
+    every cut which severs the same such connections.
+    """
+    def __init__(self, subsystem, parent_cache=None):
+        super().__init__(subsystem, parent_cache=parent_cache)
+        self._subsystem_key = (subsystem.network, subsystem.node_indices,
+                               subsystem.state)
+
+    def _digest(self, key):
+        """Return the key of a |Mice| in the store, given its local key."""
+        _prefix, direction, mechanism, purviews = key
+        cut = self.subsystem.cut
+        if direction == constants.DIRECTIONS[constants.PAST]:
+            severed = (cut.severed,
+                       tuple(sorted(set(mechanism) & set(cut.intact))))
+        else:
+            severed = (tuple(sorted(set(mechanism) & set(cut.severed))),
+                       cut.intact)
+        if not all(severed):
+            severed = ()
+        # Imported here to avoid a circular import.
+        from .utils import digest
+
+        return digest((self._subsystem_key, config.result_options(), key,
+                       severed))
+
+    @abc.abstractmethod
+    def _load(self, digest):
+        """Return the pickled |Mice| with this key, or ``None``."""
+
+    @abc.abstractmethod
+    def _save(self, digest, data):
+        """Store a pickled |Mice| with this key."""
+
+    def get(self, key):
+        """Get a value out of the cache.
+
+        If the |Mice| is not in the local cache, look for it in the store.
+        """
+        mice = super().get(key)
+        if mice is not None:
+            return mice
+
+        data = self._load(self._digest(key))
+        if data is None:
+            return None
+
+        mice = _MiceUnpickler(io.BytesIO(data), self.subsystem).load()
+        self.misses -= 1
+        self.hits += 1
+        super().set(key, mice)
+        return mice
+
+    def set(self, key, mice):
+        """Set a value in the local cache and the store."""
+        super().set(key, mice)
+
+        f = io.BytesIO()
+        _MicePickler(f, self.subsystem).dump(mice)
+        self._save(self._digest(key), f.getvalue())
+
+
+class SharedMiceCache(_StoredMiceCache):
+    """A cache for |Mice| objects shared by all processes of a computation.
+
+    |Mice| are written to the files of :func:`shared_mice_directory`, so that
+    a |Mice| computed by one worker process is reused by the others.
+
+    See :func:`MiceCache` for more info.
+    """
+    def __init__(self, subsystem, parent_cache=None):
+        super().__init__(subsystem, parent_cache=parent_cache)
+        self.directory = shared_mice_directory()
+
+    def _load(self, digest):
+        try:
+            with open(os.path.join(self.directory, digest), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _save(self, digest, data):
+        """Write a pickled |Mice| to its file.
+
+        The file is written atomically, so that other processes never read
+        a partially written |Mice|.
+        """
+        path = os.path.join(self.directory, digest)
+        if os.path.exists(path):
+            return
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class SqliteStore:
+    """An embedded key-value store in an SQLite database file.
+
+    The database uses write-ahead logging, so that any number of processes
+    can read it while another writes to it. Writes are not synced to disk
+    until the log is checkpointed, so the most recent values may be lost if
+    the machine crashes, but never corrupted; they are only a cache. Each
+    process opens its own connection when it first uses the store.
+
+    Args:
+        path (str): The database file. It is created if it does not exist.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._pid = None
+        self._conn = None
+
+    @property
+    def conn(self):
+        """The connection of this process to the database."""
+        if self._pid != os.getpid():
+            # sqlite3 is only imported once the store is used.
+            import sqlite3
+
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)),
+                        exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=60,
+                                   isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            # Each value is written in its own transaction, so don't wait for
+            # the disk on every commit.
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS store '
+                         '(key TEXT PRIMARY KEY, value BLOB NOT NULL)')
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def __getstate__(self):
+        # Connections cannot be pickled; other processes open their own.
+        return {'path': self.path, '_pid': None, '_conn': None}
+
+    def get(self, key):
+        """Return the value stored with a key, or ``None``."""
+        row = self.conn.execute('SELECT value FROM store WHERE key = ?',
+                                (key,)).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key, value):
+        """Store a value with a key.
+
+        If the key is already present this does nothing, since equal keys
+        have equal values.
+        """
+        self.conn.execute('INSERT OR IGNORE INTO store VALUES (?, ?)',
+                          (key, value))
+
+    def size(self):
+        """Number of items in the store."""
+        return self.conn.execute('SELECT COUNT(*) FROM store').fetchone()[0]
+
+    def clear(self):
+        """Delete all items in the store."""
+        self.conn.execute('DELETE FROM store')
+
+
+# The store of persistent |Mice|, once opened.
+_mice_store = None
+
+
+def mice_store():
+    """Return the :class:`SqliteStore` of persistent |Mice|, in
+    ``config.FS_CACHE_DIRECTORY``."""
+    global _mice_store
+    path = os.path.join(config.FS_CACHE_DIRECTORY, 'mice.sqlite3')
+    if _mice_store is None or _mice_store.path != path:
+        _mice_store = SqliteStore(path)
+    return _mice_store
+
+
+class PersistentMiceCache(_StoredMiceCache):
+    """A cache for |Mice| objects which persists across runs.
+
+    |Mice| are stored in the database of :func:`mice_store`, which can be
+    read and written by many processes at once. Their keys are digests of
+    the network, state, mechanism, purviews and relevant part of the cut, so
+    stored |Mice| are reused by later computations on the same network, and
+    can be copied to other machines.
+
+    See :func:`MiceCache` for more info.
+    """
+    def __init__(self, subsystem, parent_cache=None):
+        super().__init__(subsystem, parent_cache=parent_cache)
+        self.store = mice_store()
+
+    def _load(self, digest):
+        return self.store.get(digest)
+
+    def _save(self, digest, data):
+        self.store.set(digest, data)
+
+
+def _shares_mice(subsystem):
+    """Return whether the |Mice| of a subsystem can be shared.
+
+    Shared and persistent |Mice| are keyed by the network, nodes and state of
+    their subsystem, which do not determine a macro subsystem.
+    """
+    # Imported here to avoid a circular import.
+    from .subsystem import Subsystem
+
+    return type(subsystem) is Subsystem
+
+
 def MiceCache(subsystem, parent_cache=None):
     """Construct a Mice cache.
 
-    Uses either a Redis-backed cache or a local dict cache on the object.
+    Uses either a Redis-backed cache, a persistent SQLite-backed cache, a
+    cache shared by all processes of the computation, or a local dict cache
+    on the object.
 
     Args:
         subsystem (Subsystem): The subsystem that this is a cache for.
@@ -406,6 +849,10 @@ def MiceCache(subsystem, parent_cache=None):
     """
     if config.REDIS_CACHE:
         cls = RedisMiceCache
+    elif config.PERSISTENT_MICE_CACHE and _shares_mice(subsystem):
+        cls = PersistentMiceCache
+    elif config.SHARED_MICE_CACHE and _shares_mice(subsystem):
+        cls = SharedMiceCache
     else:
         cls = DictMiceCache
     return cls(subsystem, parent_cache=parent_cache)
@@ -417,7 +864,7 @@ class PurviewCache(DictCache):
     def set(self, key, value):
         """Only set if purview caching is enabled"""
         if config.CACHE_POTENTIAL_PURVIEWS:
-            self.cache[key] = value
+            super().set(key, value)
 
 
 def method(cache_name, key_prefix=None):
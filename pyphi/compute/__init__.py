@@ -18,13 +18,18 @@ Attributes:
     complexes: Alias for :func:`big_phi.complexes`.
     condensed: Alias for :func:`big_phi.condensed`.
     evaluate_cut: Alias for :func:`big_phi.evaluate_cut`.
+    iter_complexes: Alias for :func:`big_phi.iter_complexes`.
     main_complex: Alias for :func:`big_phi.main_complex`.
     possible_complexes: Alias for :func:`big_phi.possible_complexes`.
+    resume: Alias for :func:`big_phi.resume`.
+    state_sweep: Alias for :func:`big_phi.state_sweep`.
     subsystems: Alias for :func:`big_phi.subsystems`.
+    trajectory: Alias for :func:`big_phi.trajectory`.
 """
 
 from .big_phi import (all_complexes, big_mip, big_phi, complexes, condensed,
-                      evaluate_cut, main_complex, possible_complexes,
-                      subsystems)
+                      evaluate_cut, iter_complexes, main_complex,
+                      possible_complexes, resume, state_sweep, subsystems,
+                      trajectory)
 from .concept import concept, conceptual_information, constellation
 from .distance import concept_distance, constellation_distance
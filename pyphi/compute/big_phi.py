@@ -7,16 +7,18 @@ Methods for computing concepts, constellations, and integrated information of
 subsystems.
 """
 
-import functools
 import logging
-import multiprocessing
 from time import time
 
+import numpy as np
+
 from . import parallel
+from .checkpoint import Checkpoint
 from .concept import constellation
 from .distance import constellation_distance
-from .. import config, memory, utils, validate
-from ..models import BigMip, Cut, _null_bigmip, _single_node_bigmip
+from .. import config, constants, memory, utils, validate
+from ..models import (BigMip, Constellation, Cut, _null_bigmip,
+                      _single_node_bigmip)
 from ..subsystem import Subsystem
 
 # Create a logger for this module.
@@ -27,6 +29,10 @@ log = logging.getLogger(__name__)
 def evaluate_cut(uncut_subsystem, cut, unpartitioned_constellation):
     """Find the |BigMip| for a given cut.
 
+    Concepts of the unpartitioned constellation whose core cause and core
+    effect are not damaged by the cut are carried over to the partitioned
+    constellation unchanged; only the remaining mechanisms are recomputed.
+
     Args:
         uncut_subsystem (|Subsystem|): The subsystem without the cut applied.
         cut (|Cut|): The cut to evaluate.
@@ -55,7 +61,20 @@ def evaluate_cut(uncut_subsystem, cut, unpartitioned_constellation):
         mechanisms = set(
             [c.mechanism for c in unpartitioned_constellation] +
             list(cut.all_cut_mechanisms()))
-    partitioned_constellation = constellation(cut_subsystem, mechanisms)
+
+    # Macro subsystems are cut at the micro level, so their concepts cannot
+    # be checked for damage.
+    if isinstance(uncut_subsystem, macro.MacroSubsystem):
+        unaffected = []
+    else:
+        unaffected = [c for c in unpartitioned_constellation
+                      if not _damaged_by_cut(c, cut_subsystem)]
+    mechanisms -= {c.mechanism for c in unaffected}
+    log.debug("Reusing {} of {} concepts.".format(
+        len(unaffected), len(unpartitioned_constellation)))
+
+    partitioned_constellation = Constellation(
+        unaffected + list(constellation(cut_subsystem, mechanisms)))
 
     log.debug("Finished evaluating cut {}.".format(cut))
 
@@ -70,73 +89,86 @@ def evaluate_cut(uncut_subsystem, cut, unpartitioned_constellation):
         cut_subsystem=cut_subsystem)
 
 
+def _damaged_by_cut(concept, cut_subsystem):
+    """Return whether the core cause or core effect of a concept is damaged by
+    the cut of ``cut_subsystem``."""
+    return (concept.cause.damaged_by_cut(cut_subsystem) or
+            concept.effect.damaged_by_cut(cut_subsystem))
+
+
 # Wrapper for `evaluate_cut` for parallel processing.
-def _eval_wrapper(in_queue, out_queue, subsystem, unpartitioned_constellation):
-    while True:
-        cut = in_queue.get()
-        if cut is None:
-            break
-        new_mip = evaluate_cut(subsystem, cut, unpartitioned_constellation)
-        out_queue.put(new_mip)
-    out_queue.put(None)
+def _eval_wrapper(subsystem, unpartitioned_constellation, cut):
+    return evaluate_cut(subsystem, cut, unpartitioned_constellation)
 
 
-def _find_mip_parallel(subsystem, cuts, unpartitioned_constellation, min_mip):
+def _find_mip_parallel(subsystem, cuts, unpartitioned_constellation, min_mip,
+                       deadline=None, checkpoint=None, bound=None):
     """Find the MIP for a subsystem with a parallel loop over all cuts.
 
-    Uses the specified number of cores.
+    Uses the specified number of cores. The cuts are evaluated by a persistent
+    pool of worker processes, which is reused across calls.
+
+    If a ``deadline`` (as returned by :func:`time.time`) is given, the search
+    stops at the first result received after it has passed. The number of
+    cuts that were evaluated is stored in the ``cuts_evaluated`` attribute of
+    the returned |BigMip|. Each evaluated cut is recorded in the
+    ``checkpoint``, if one is given. If a ``bound`` is given, the search also
+    stops as soon as a cut with |big_phi| at most ``bound`` is found.
     """
-    number_of_processes = parallel.get_num_processes()
-    # Define input and output queues to allow short-circuit if a cut if found
-    # with zero Phi. Load the input queue with all possible cuts and a 'poison
-    # pill' for each process.
-    in_queue = multiprocessing.Queue()
-    out_queue = multiprocessing.Queue()
-    for cut in cuts:
-        in_queue.put(cut)
-    for i in range(number_of_processes):
-        in_queue.put(None)
-    # Initialize the processes and start them.
-    processes = [
-        multiprocessing.Process(target=_eval_wrapper,
-                                args=(in_queue, out_queue, subsystem,
-                                      unpartitioned_constellation))
-        for i in range(number_of_processes)
-    ]
-    for i in range(number_of_processes):
-        processes[i].start()
-    # Continue to process output queue until all processes have completed, or a
-    # 'poison pill' has been returned.
-    while True:
-        new_mip = out_queue.get()
-        if new_mip is None:
-            number_of_processes -= 1
-            if number_of_processes == 0:
-                break
-        elif new_mip.phi == 0:
+    pool = parallel.get_pool()
+    results = pool.imap_unordered(_eval_wrapper, cuts, subsystem,
+                                  unpartitioned_constellation)
+    cuts_evaluated = 0
+    for new_mip in results:
+        cuts_evaluated += 1
+        # Short-circuit as soon as we find a MIP with effectively 0 phi,
+        # cancelling the remaining cuts.
+        if new_mip.phi == 0:
             min_mip = new_mip
-            for process in processes:
-                process.terminate()
+            results.close()
             break
         elif new_mip < min_mip:
             min_mip = new_mip
+        if checkpoint is not None:
+            checkpoint.cut_evaluated(subsystem, new_mip.cut, min_mip)
+        if ((bound is not None and min_mip.phi <= bound) or
+                (deadline is not None and time() > deadline)):
+            results.close()
+            break
+    min_mip.cuts_evaluated = cuts_evaluated
     return min_mip
 
 
 def _find_mip_sequential(subsystem, cuts, unpartitioned_constellation,
-                         min_mip):
+                         min_mip, deadline=None, checkpoint=None,
+                         bound=None):
     """Find the minimal cut for a subsystem by sequentially loop over all cuts.
 
     Holds only two |BigMip|s in memory at once.
+
+    If a ``deadline`` (as returned by :func:`time.time`) is given, the search
+    stops after the first cut that finishes after it has passed. The number of
+    cuts that were evaluated is stored in the ``cuts_evaluated`` attribute of
+    the returned |BigMip|. Each evaluated cut is recorded in the
+    ``checkpoint``, if one is given. If a ``bound`` is given, the search also
+    stops as soon as a cut with |big_phi| at most ``bound`` is found.
     """
+    cuts_evaluated = 0
     for i, cut in enumerate(cuts):
         new_mip = evaluate_cut(subsystem, cut, unpartitioned_constellation)
+        cuts_evaluated += 1
         log.debug("Finished {} of {} cuts.".format(i + 1, len(cuts)))
         if new_mip < min_mip:
             min_mip = new_mip
+        if checkpoint is not None:
+            checkpoint.cut_evaluated(subsystem, cut, min_mip)
         # Short-circuit as soon as we find a MIP with effectively 0 phi.
         if min_mip.phi == 0:
             break
+        if ((bound is not None and min_mip.phi <= bound) or
+                (deadline is not None and time() > deadline)):
+            break
+    min_mip.cuts_evaluated = cuts_evaluated
     return min_mip
 
 
@@ -160,23 +192,244 @@ def big_mip_bipartitions(nodes):
             for bipartition in bipartitions]
 
 
-# TODO document big_mip
-@memory.cache(ignore=["subsystem"])
-def _big_mip(cache_key, subsystem):
-    """Return the minimal information partition of a subsystem.
+def automorphisms(subsystem):
+    """Return a generating set of the symmetries of a subsystem.
+
+    A symmetry is a permutation of the subsystem's nodes that maps its TPM,
+    connectivity matrix, state and perturbation probabilities onto
+    themselves. Cuts that are mapped onto each other by a symmetry have the
+    same |big_phi|.
+
+    Rather than the whole group of symmetries, which can have up to ``n!``
+    elements, at most one symmetry is found for each pair of a node ``i`` and
+    an image ``j > i``: one which fixes the nodes before ``i`` and maps ``i``
+    to ``j``, if ``j`` is not already in the orbit of ``i`` under the
+    symmetries found so far. These generate the group, and there are fewer
+    than ``n**2`` of them.
+
+    Macro subsystems are cut at the micro level, so only the identity is
+    returned for them.
 
     Args:
-        subsystem (Subsystem): The candidate set of nodes.
+        subsystem (Subsystem): The subsystem.
 
     Returns:
-        |BigMip|: A nested structure containing all the data from the
-        intermediate calculations. The top level contains the basic MIP
-        information for the given subsystem.
+        list[dict[int, int]]: The generators, each as a mapping from node
+        indices to node indices. The identity is always the first.
+    """
+    from .. import macro
+
+    nodes = subsystem.node_indices
+    identity = {node: node for node in nodes}
+    if isinstance(subsystem, macro.MacroSubsystem):
+        return [identity]
+
+    n = len(nodes)
+    tpm = subsystem.tpm[..., list(nodes)]
+    cm = subsystem.cm[np.ix_(nodes, nodes)]
+    state = utils.state_of(nodes, subsystem.state)
+    perturb_vector = np.asarray(subsystem.perturb_vector)[list(nodes)]
+
+    # Nodes can only be mapped onto nodes with the same invariants. The sorted
+    # values of a node's TPM do not depend on the order of its inputs.
+    def invariant(i):
+        return (state[i], perturb_vector[i], cm[i, i], cm[i].sum(),
+                cm[:, i].sum(),
+                tuple(np.round(np.sort(tpm[..., i], axis=None),
+                               config.PRECISION)))
+
+    invariants = [invariant(i) for i in range(n)]
+
+    def preserves_tpm(images):
+        # Permute the input dimensions of the TPM; the TPM is preserved if
+        # this is the same as permuting its outputs.
+        axes = list(range(tpm.ndim))
+        for i, j in enumerate(images):
+            axes[nodes[j]] = nodes[i]
+        return np.allclose(np.transpose(tpm, axes), tpm[..., images],
+                           atol=constants.EPSILON, rtol=0)
+
+    def compatible(images, j):
+        # Whether the next node can be mapped to ``j`` given the images of
+        # the previous nodes, without breaking the connectivity matrix.
+        i = len(images)
+        return (j not in images and invariants[i] == invariants[j] and
+                all(cm[i, k] == cm[j, l] and cm[k, i] == cm[l, j]
+                    for k, l in enumerate(images)))
+
+    # Assign an image to each node in turn, backtracking when the partial
+    # permutation does not preserve the connectivity matrix, until a symmetry
+    # is found.
+    def extend(images):
+        if len(images) == n:
+            return images if preserves_tpm(images) else None
+        for j in range(n):
+            if compatible(images, j):
+                symmetry = extend(images + [j])
+                if symmetry is not None:
+                    return symmetry
+        return None
+
+    generators = []
+    for i in range(n):
+        fixed = list(range(i))
+        # The orbit of ``i`` under the generators which fix the nodes before
+        # it.
+        stabilizer = [g for g in generators if g[:i] == fixed]
+        orbit, frontier = {i}, [i]
+        for j in range(i + 1, n):
+            while frontier:
+                k = frontier.pop()
+                for g in stabilizer:
+                    if g[k] not in orbit:
+                        orbit.add(g[k])
+                        frontier.append(g[k])
+            if j in orbit or not compatible(fixed, j):
+                continue
+            symmetry = extend(fixed + [j])
+            if symmetry is not None:
+                generators.append(symmetry)
+                stabilizer.append(symmetry)
+                frontier = list(orbit)
+
+    return [identity] + [{nodes[i]: nodes[j] for i, j in enumerate(g)}
+                         for g in generators]
+
+
+def symmetric_cut_representatives(cuts, symmetries):
+    """Return one cut from each set of cuts that are equivalent under the
+    given symmetries.
+
+    The sets are the orbits of the group generated by the symmetries, found
+    by merging each cut with its image under each symmetry. The first cut of
+    each set in ``cuts`` is returned, so that ties between cuts with equal
+    |big_phi| are resolved as if all cuts were evaluated.
+
+    Args:
+        cuts (list[Cut]): The cuts.
+        symmetries (list[dict[int, int]]): Generators of the symmetries of the
+            subsystem, as returned by :func:`automorphisms`.
+
+    Returns:
+        list[Cut]: The representative cuts, in the same order as ``cuts``.
+    """
+    index = {cut: i for i, cut in enumerate(cuts)}
+    # A union-find forest over the cuts, whose roots are the first cuts of
+    # their sets.
+    parent = list(range(len(cuts)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, cut in enumerate(cuts):
+        for symmetry in symmetries:
+            j = index.get(Cut(
+                tuple(sorted(symmetry[node] for node in cut.severed)),
+                tuple(sorted(symmetry[node] for node in cut.intact))))
+            if j is not None:
+                a, b = root(i), root(j)
+                parent[max(a, b)] = min(a, b)
+
+    return [cut for i, cut in enumerate(cuts) if root(i) == i]
+
+
+def _severed_connections(subsystem, cuts, unpartitioned_constellation):
+    """Order cuts by the number of connections they sever."""
+    cm = subsystem.network.cm
+    return sorted(cuts,
+                  key=lambda cut: cm[np.ix_(cut.severed, cut.intact)].sum())
+
+
+def _damaged_concepts(subsystem, cuts, unpartitioned_constellation):
+    """Order cuts by the number of unpartitioned concepts they damage.
+
+    Damage is found as in :meth:`~pyphi.models.Mice.damaged_by_cut`, from the
+    connections that each cut severs, without applying the cuts to the
+    subsystem. Macro subsystems are cut at the micro level, so their cuts are
+    not reordered.
+    """
+    from .. import macro
+
+    if isinstance(subsystem, macro.MacroSubsystem):
+        return cuts
+
+    # The connections that matter to the core cause or core effect of each
+    # concept.
+    concepts = [(concept.mechanism,
+                 concept.cause._relevant_connections(subsystem) +
+                 concept.effect._relevant_connections(subsystem))
+                for concept in unpartitioned_constellation]
+
+    def damaged(cut):
+        cut_matrix = cut.cut_matrix()
+        return sum(1 for mechanism, connections in concepts
+                   if cut.splits_mechanism(mechanism) or
+                   np.any(connections * cut_matrix))
+
+    return sorted(cuts, key=damaged)
+
+
+# Strategies for ordering the cuts evaluated by `big_mip`, by name. Each takes
+# the subsystem, the cuts and the unpartitioned constellation, and returns the
+# cuts in the order they should be evaluated. Further strategies can be added
+# and selected with ``config.CUT_ORDERING``.
+CUT_ORDERINGS = {
+    'none': lambda subsystem, cuts, unpartitioned_constellation: cuts,
+    'severed_connections': _severed_connections,
+    'damaged_concepts': _damaged_concepts,
+}
+
+
+def order_cuts(subsystem, cuts, unpartitioned_constellation):
+    """Order cuts so that those likely to have the least |big_phi| come first.
+
+    Since the search for the MIP stops at the first cut with zero |big_phi|,
+    evaluating such cuts early saves time for reducible subsystems. The
+    strategy is chosen by ``config.CUT_ORDERING``.
+
+    Args:
+        subsystem (Subsystem): The subsystem being cut.
+        cuts (list[Cut]): The cuts to order.
+        unpartitioned_constellation (Constellation): The constellation of the
+            subsystem.
+
+    Returns:
+        list[Cut]: The ordered cuts. Cuts that rank equally keep their
+        original order.
+
+    Raises:
+        ValueError: If ``config.CUT_ORDERING`` is not a known strategy.
+    """
+    try:
+        strategy = CUT_ORDERINGS[config.CUT_ORDERING]
+    except KeyError:
+        raise ValueError('Unknown cut ordering {}; must be one of {}'.format(
+            config.CUT_ORDERING, sorted(CUT_ORDERINGS)))
+    return strategy(subsystem, cuts, unpartitioned_constellation)
+
+
+def _compute_big_mip(subsystem, time_budget=None, cut_budget=None,
+                     checkpoint=None, bound=None):
+    """Return the minimal information partition of a subsystem.
+
+    See :func:`big_mip` for a description of the arguments. If a
+    :class:`~pyphi.compute.checkpoint.Checkpoint` is given, progress is
+    recorded in it, and the computation continues from any progress that it
+    already holds for the subsystem.
+
+    If a ``bound`` is given, the search stops as soon as a cut with |big_phi|
+    at most ``bound`` is found. The |BigMip| of that cut is returned, with
+    ``upper_bound`` set if not every cut was evaluated.
     """
     log.info("Calculating big-phi data for {}...".format(subsystem))
     start = time()
 
-    if config.PARALLEL_CUT_EVALUATION:
+    # Worker processes cannot start workers of their own, so evaluate the cuts
+    # sequentially if this is already running in a worker.
+    if config.PARALLEL_CUT_EVALUATION and not parallel.in_worker():
         _find_mip = _find_mip_parallel
     else:
         _find_mip = _find_mip_sequential
@@ -186,6 +439,8 @@ def _big_mip(cache_key, subsystem):
     def time_annotated(big_mip, small_phi_time=0.0):
         big_mip.time = round(time() - start, config.PRECISION)
         big_mip.small_phi_time = round(small_phi_time, config.PRECISION)
+        if big_mip.cuts_evaluated is None:
+            big_mip.cuts_evaluated = 0
         return big_mip
 
     # Special case for single-node subsystems.
@@ -212,11 +467,26 @@ def _big_mip(cache_key, subsystem):
         return time_annotated(_null_bigmip(subsystem))
     # =========================================================================
 
-    log.debug("Finding unpartitioned constellation...")
-    small_phi_start = time()
-    unpartitioned_constellation = constellation(subsystem)
-    small_phi_time = round(time() - small_phi_start, config.PRECISION)
-    log.debug("Found unpartitioned constellation.")
+    progress = None
+    if checkpoint is not None:
+        progress = checkpoint.get_progress(subsystem)
+
+    if progress is not None:
+        log.info("Resuming {} from checkpoint: {} cuts evaluated.".format(
+            subsystem, len(progress.evaluated_cuts)))
+        unpartitioned_constellation = progress.unpartitioned_constellation
+        small_phi_time = progress.small_phi_time
+        evaluated_cuts = set(progress.evaluated_cuts)
+    else:
+        log.debug("Finding unpartitioned constellation...")
+        small_phi_start = time()
+        unpartitioned_constellation = constellation(subsystem)
+        small_phi_time = round(time() - small_phi_start, config.PRECISION)
+        log.debug("Found unpartitioned constellation.")
+        evaluated_cuts = set()
+        if checkpoint is not None and unpartitioned_constellation:
+            checkpoint.start(subsystem, unpartitioned_constellation,
+                             small_phi_time)
 
     if not unpartitioned_constellation:
         # Short-circuit if there are no concepts in the unpartitioned
@@ -224,10 +494,37 @@ def _big_mip(cache_key, subsystem):
         result = time_annotated(_null_bigmip(subsystem))
     else:
         cuts = big_mip_bipartitions(subsystem.cut_indices)
-        min_mip = _null_bigmip(subsystem)
-        min_mip.phi = float('inf')
+        if config.SKIP_SYMMETRIC_CUTS:
+            symmetries = automorphisms(subsystem)
+            if len(symmetries) > 1:
+                cuts = symmetric_cut_representatives(cuts, symmetries)
+                log.debug("Found {} symmetries; evaluating {} cuts.".format(
+                    len(symmetries), len(cuts)))
+        cuts = order_cuts(subsystem, cuts, unpartitioned_constellation)
+        number_of_cuts = len(cuts)
+        cuts = [cut for cut in cuts if cut not in evaluated_cuts]
+        if cut_budget is not None:
+            cuts = cuts[:max(cut_budget, 1)]
+        deadline = None if time_budget is None else start + time_budget
+
+        if progress is not None and progress.min_mip is not None:
+            min_mip = progress.min_mip
+        else:
+            min_mip = _null_bigmip(subsystem)
+            min_mip.phi = float('inf')
         min_mip = _find_mip(subsystem, cuts, unpartitioned_constellation,
-                            min_mip)
+                            min_mip, deadline=deadline, checkpoint=checkpoint,
+                            bound=bound)
+        min_mip.cuts_evaluated += len(evaluated_cuts)
+        # Unless a cut with zero phi was found, phi is only an upper bound if
+        # the budget ran out or the bound was reached before every cut was
+        # evaluated.
+        min_mip.upper_bound = (min_mip.phi != 0 and
+                               min_mip.cuts_evaluated < number_of_cuts)
+        if min_mip.upper_bound:
+            log.info("Stopped after evaluating {} of {} cuts; phi is an "
+                     "upper bound.".format(min_mip.cuts_evaluated,
+                                           number_of_cuts))
         result = time_annotated(min_mip, small_phi_time)
 
     log.info("Finished calculating big-phi data for {}.".format(subsystem))
@@ -236,12 +533,73 @@ def _big_mip(cache_key, subsystem):
     return result
 
 
-# Wrapper to ensure that the cache key is the native hash of the subsystem, so
-# joblib doesn't mistakenly recompute things when the subsystem's MICE cache is
-# changed.
-@functools.wraps(_big_mip)
-def big_mip(subsystem):
-    return _big_mip(hash(subsystem), subsystem)
+@memory.cache(ignore=["subsystem"])
+def _big_mip(cache_key, subsystem):
+    return _compute_big_mip(subsystem)
+
+
+def big_mip(subsystem, time_budget=None, cut_budget=None, checkpoint=None):
+    """Return the minimal information partition of a subsystem.
+
+    By default every cut is evaluated, unless one with zero |big_phi| is
+    found. A time or cut budget can be given to bound the cost of the
+    computation instead. When it runs out, the best |BigMip| found so far is
+    returned, with its ``upper_bound`` attribute set, since the true |big_phi|
+    may be lower. At least one cut is always evaluated.
+
+    Args:
+        subsystem (Subsystem): The candidate set of nodes.
+
+    Keyword Args:
+        time_budget (float): The number of seconds after which to stop
+            evaluating cuts. This includes the time taken to compute the
+            unpartitioned constellation. The budget is checked after each
+            cut, so the computation may overrun it by the time taken to
+            evaluate one cut.
+        cut_budget (int): The maximum number of cuts to evaluate.
+        checkpoint (str): A file in which to periodically save the progress
+            of the computation, every ``config.CHECKPOINT_INTERVAL`` seconds.
+            If the file already holds a checkpoint of this computation, it is
+            resumed from there. See :func:`resume`.
+
+    Returns:
+        |BigMip|: A nested structure containing all the data from the
+        intermediate calculations. The top level contains the basic MIP
+        information for the given subsystem. Its ``cuts_evaluated``
+        attribute is the number of cuts that were evaluated.
+    """
+    if checkpoint is not None:
+        checkpoint = Checkpoint.open(checkpoint, ('big_mip', subsystem))
+        result = _checkpointed_big_mip(subsystem, checkpoint,
+                                       time_budget=time_budget,
+                                       cut_budget=cut_budget)
+        checkpoint.save()
+        return result
+    if time_budget is None and cut_budget is None:
+        # Ensure that the cache key is the digest of the subsystem and the
+        # options that affect the result, so joblib doesn't mistakenly
+        # recompute things when the subsystem's MICE cache is changed, and
+        # cached results are not reused under different options.
+        return _big_mip(utils.digest((subsystem, config.result_options())),
+                        subsystem)
+    # Results of a budgeted computation depend on the budget, so they are not
+    # cached.
+    return _compute_big_mip(subsystem, time_budget=time_budget,
+                            cut_budget=cut_budget)
+
+
+def _checkpointed_big_mip(subsystem, checkpoint, time_budget=None,
+                          cut_budget=None):
+    """Return the |BigMip| of a subsystem, recording progress in a
+    checkpoint."""
+    result = checkpoint.result(subsystem)
+    if result is None:
+        result = _compute_big_mip(subsystem, time_budget=time_budget,
+                                  cut_budget=cut_budget, checkpoint=checkpoint)
+        # Subsystems whose budget ran out are resumed later.
+        if not result.upper_bound:
+            checkpoint.finish(subsystem, result)
+    return result
 
 
 def big_phi(subsystem):
@@ -291,13 +649,7 @@ def possible_complexes(network, state):
     """
     validate.is_network(network)
 
-    causally_significant_nodes = utils.causally_significant_nodes(network.cm)
-
-    for subset in utils.powerset(causally_significant_nodes):
-        # Don't return empty system
-        if len(subset) == 0:
-            continue
-
+    for subset in _possible_subsets(network):
         # Don't return subsystems that are in an impossible state.
         try:
             yield Subsystem(network, state, subset)
@@ -305,20 +657,208 @@ def possible_complexes(network, state):
             continue
 
 
-def complexes(network, state):
-    """Return a generator for all irreducible complexes of the network."""
-    return tuple(filter(None, (big_mip(subsystem) for subsystem in
-                               possible_complexes(network, state))))
+def _possible_subsets(network):
+    """Return a generator of the node subsets of :func:`possible_complexes`,
+    whatever the state of the network."""
+    causally_significant_nodes = utils.causally_significant_nodes(network.cm)
+    # Don't return empty system
+    return (subset for subset in utils.powerset(causally_significant_nodes)
+            if subset)
+
+
+# Wrapper for `big_mip` for parallel processing.
+def _big_mip_wrapper(network, state, node_indices):
+    return big_mip(Subsystem(network, state, node_indices))
+
+
+def _iter_complexes(network, state, checkpoint=None):
+    subsystems = possible_complexes(network, state)
+    if checkpoint is not None:
+        big_mips = (_checkpointed_big_mip(subsystem, checkpoint)
+                    for subsystem in subsystems)
+    elif config.PARALLEL_COMPLEX_EVALUATION and not parallel.in_worker():
+        big_mips = parallel.get_pool().imap_unordered(
+            _big_mip_wrapper,
+            (subsystem.node_indices for subsystem in subsystems),
+            network, state)
+    else:
+        big_mips = map(big_mip, subsystems)
+
+    main = None
+    for mip in filter(None, big_mips):
+        if main is None or mip > main:
+            main = mip
+        yield mip, main
+
+    if checkpoint is not None:
+        checkpoint.save()
+
+
+def iter_complexes(network, state):
+    """Yield the irreducible complexes of the network as they are computed.
+
+    Unlike :func:`complexes`, which returns only once every subsystem has been
+    evaluated, each complex is yielded as soon as its |BigMip| is found,
+    along with the main complex so far. Callers can report progress or stop
+    early, and need not keep every |BigMip| in memory.
+
+    If ``config.PARALLEL_COMPLEX_EVALUATION`` is enabled, subsystems are
+    evaluated by the worker pool and complexes are yielded in the order they
+    are finished. Other parallel computations should not be started until the
+    generator is exhausted or closed.
+
+    Args:
+        network (Network): The network.
+        state (tuple[int]): The state of the network.
+
+    Yields:
+        tuple[BigMip, BigMip]: The |BigMip| of the next complex, and the
+        |BigMip| with the greatest |big_phi| found so far.
+    """
+    return _iter_complexes(network, state)
+
+
+def complexes(network, state, checkpoint=None):
+    """Return a generator for all irreducible complexes of the network.
+
+    If ``checkpoint`` is given, progress is periodically saved to that file,
+    and resumed from it if it already exists. See :func:`resume`.
+    """
+    if checkpoint is not None:
+        checkpoint = Checkpoint.open(checkpoint,
+                                     ('complexes', network, state))
+    return tuple(mip for mip, main in
+                 _iter_complexes(network, state, checkpoint))
+
+
+def _candidate_subsets(network):
+    """Return the node subsets that could be complexes, largest first.
+
+    Subsets of the same size are in the order of :func:`possible_complexes`.
+    These do not depend on the state of the network.
+    """
+    return sorted(_possible_subsets(network), key=len, reverse=True)
+
+
+# Marks subsystems in an unreachable state in the cache of
+# `_main_complex_branch_and_bound`.
+_UNREACHABLE = object()
+
+
+def _main_complex_branch_and_bound(network, state, subsets=None, cache=None,
+                                   relevant_nodes=None):
+    """Find the main complex, skipping the rest of a subsystem's cuts once it
+    cannot beat the best complex found so far.
+
+    The |big_phi| of any cut is an upper bound on the |big_phi| of the
+    subsystem, so as soon as a cut with |big_phi| at most that of the best
+    complex is found, the subsystem can be discarded. No bound is known before
+    the first cut is evaluated. Larger subsystems are
+    evaluated first: they win ties in |big_phi|, so they give the tightest
+    bound early. Subsystems of the same size are evaluated in the order of
+    :func:`possible_complexes`, so the result is the same as that of an
+    exhaustive search.
+
+    ``subsets`` are the candidate subsets returned by
+    :func:`_candidate_subsets`, which can be shared between states.
+
+    If a ``cache`` dictionary is given, the |BigMip| of each subset is stored
+    in it under the subset and the state of its ``relevant_nodes`` (see
+    :func:`_relevant_nodes`), and reused for other states in which those
+    nodes are in the same state.
+    """
+    if subsets is None:
+        subsets = _candidate_subsets(network)
+
+    best = None
+    for subset in subsets:
+        mip = None
+        if cache is not None:
+            key = (subset, utils.state_of(relevant_nodes[subset], state))
+            mip = cache.get(key)
+            if mip is _UNREACHABLE:
+                continue
+            # A pruned result can only be reused if it would be pruned again.
+            if (mip is not None and mip.upper_bound and
+                    (best is None or mip.phi > best.phi)):
+                mip = None
+
+        if mip is None:
+            try:
+                subsystem = Subsystem(network, state, subset)
+            except validate.StateUnreachableError:
+                if cache is not None:
+                    cache[key] = _UNREACHABLE
+                continue
+
+            # Cached |BigMip|s are exact, so they are used and stored rather
+            # than bounded if caching is enabled.
+            if best is None or config.CACHE_BIGMIPS:
+                mip = big_mip(subsystem)
+            else:
+                # Every subsystem evaluated from now on loses ties with the
+                # best complex so far.
+                mip = _compute_big_mip(subsystem, bound=best.phi)
+                if mip.upper_bound:
+                    log.debug("Pruned {}.".format(subsystem))
+            if cache is not None:
+                cache[key] = mip
+
+        if mip and (best is None or mip > best):
+            best = mip
+
+    return best
+
+
+def _relevant_nodes(network, subsets):
+    """Return, for each subset, the nodes whose state determines the |BigMip|
+    of the subsystem.
+
+    These are the nodes of the subset and the nodes that the TPM of any of
+    them depends on. The states of other nodes are only background conditions
+    that the subsystem's TPM does not depend on.
+    """
+    tpm = network.tpm
+    # `inputs[i]` is the set of nodes whose state the TPM of node `i` depends
+    # on.
+    inputs = [set() for i in network.node_indices]
+    for j in network.node_indices:
+        if tpm.shape[j] == 1:
+            continue
+        changed = (np.take(tpm, 1, axis=j) != np.take(tpm, 0, axis=j))
+        for i in np.where(changed.reshape(-1, network.size).any(0))[0]:
+            inputs[i].add(j)
+
+    return {subset: tuple(sorted(set(subset).union(
+                *(inputs[i] for i in subset))))
+            for subset in subsets}
+
+
+def main_complex(network, state, checkpoint=None):
+    """Return the main complex of the network.
 
+    If ``checkpoint`` is given, progress is periodically saved to that file,
+    and resumed from it if it already exists. See :func:`resume`.
 
-def main_complex(network, state):
-    """Return the main complex of the network."""
+    Unless a checkpoint is given or ``config.PARALLEL_COMPLEX_EVALUATION`` is
+    enabled, the search over subsystems is pruned: the evaluation of a
+    subsystem's cuts stops as soon as it is clear that it cannot beat the best
+    complex found so far.
+    """
     log.info("Calculating main complex...")
 
-    result = complexes(network, state)
-    if result:
-        result = max(result)
+    if checkpoint is not None:
+        checkpoint = Checkpoint.open(checkpoint,
+                                     ('main_complex', network, state))
+    if checkpoint is None and (not config.PARALLEL_COMPLEX_EVALUATION or
+                               parallel.in_worker()):
+        result = _main_complex_branch_and_bound(network, state)
     else:
+        # Only the main complex so far is kept, rather than every complex.
+        result = None
+        for mip, result in _iter_complexes(network, state, checkpoint):
+            pass
+    if result is None:
         empty_subsystem = Subsystem(network, state, ())
         result = _null_bigmip(empty_subsystem)
 
@@ -328,6 +868,161 @@ def main_complex(network, state):
     return result
 
 
+def _reachable(network, state):
+    """Return whether a state of the network can be reached from some state.
+
+    See :func:`pyphi.validate.state_reachable`.
+    """
+    try:
+        validate.state_reachable(
+            Subsystem(network, state, network.node_indices))
+    except validate.StateUnreachableError:
+        return False
+    return True
+
+
+# Wrapper for `main_complex` for parallel processing. Only the Phi and nodes of
+# the main complex are returned, to keep results small.
+def _state_sweep_wrapper(network, subsets, relevant_nodes, cache, state):
+    mip = _main_complex_branch_and_bound(network, state, subsets, cache,
+                                         relevant_nodes)
+    if mip is None:
+        return state, 0.0, ()
+    return state, mip.phi, mip.subsystem.node_indices
+
+
+def state_sweep(network, states=None):
+    """Find the main complex of a network in each of many states.
+
+    Work that does not depend on the state, such as finding the candidate
+    subsystems and the network's potential purviews, is shared between
+    states. As in :func:`trajectory`, the |BigMip| of a subsystem is reused in
+    every state in which the subsystem's nodes, and the nodes its TPM depends
+    on, are in the same state. If ``config.PARALLEL_STATE_EVALUATION`` is
+    enabled, the states are distributed across the worker pool, each worker
+    reusing the |BigMip|s of the states it has evaluated, and the subsystems
+    of each state are evaluated sequentially.
+
+    Args:
+        network (Network): The network.
+
+    Keyword Args:
+        states (Iterable[tuple[int]]): The states of the network. Defaults to
+            every state that can be reached according to the network's TPM.
+
+    Returns:
+        np.ndarray: A structured array with a row for each state, in the
+        order given, with the fields ``state`` (the state of each node),
+        ``phi`` (the |big_phi| of the main complex) and ``main_complex``
+        (whether each node is in the main complex).
+    """
+    if states is None:
+        states = [state for state in utils.all_states(network.size)
+                  if _reachable(network, state)]
+    states = [tuple(state) for state in states]
+
+    n = network.size
+    table = np.zeros(len(states), dtype=[('state', np.int8, (n,)),
+                                         ('phi', float),
+                                         ('main_complex', bool, (n,))])
+    rows = {}
+    for i, state in enumerate(states):
+        table['state'][i] = state
+        rows.setdefault(state, []).append(i)
+
+    subsets = _candidate_subsets(network)
+    relevant_nodes = _relevant_nodes(network, subsets)
+    # Shared arguments are sent to each worker once, so every worker fills
+    # its own copy of the cache.
+    cache = {}
+    unique_states = list(rows)
+    if config.PARALLEL_STATE_EVALUATION and not parallel.in_worker():
+        results = parallel.get_pool().imap_unordered(
+            _state_sweep_wrapper, unique_states, network, subsets,
+            relevant_nodes, cache)
+    else:
+        results = (_state_sweep_wrapper(network, subsets, relevant_nodes,
+                                        cache, state)
+                   for state in unique_states)
+
+    for state, phi, node_indices in results:
+        log.debug("Main complex of state {}: {}, phi = {}.".format(
+            state, node_indices, phi))
+        for i in rows[state]:
+            table['phi'][i] = phi
+            table['main_complex'][i, list(node_indices)] = True
+
+    return table
+
+
+def trajectory(network, states, steps=None, seed=None):
+    """Find the main complex of a network along a time series of states.
+
+    Consecutive states usually differ in only a few nodes, so the |BigMip| of
+    each subsystem is reused in every later step in which the subsystem's
+    nodes, and the nodes its TPM depends on, are in the same state. Only
+    subsystems whose conditioning inputs have changed are recomputed.
+
+    Args:
+        network (Network): The network.
+        states (Iterable[tuple[int]] or tuple[int]): The time series of states
+            of the network, or the initial state if ``steps`` is given.
+
+    Keyword Args:
+        steps (int): If given, the time series is simulated for this many
+            steps from the initial state ``states`` with
+            :func:`pyphi.utils.simulate`.
+        seed (int): The seed used to simulate the time series.
+
+    Returns:
+        np.ndarray: A structured array with a row for each step, with the
+        same fields as the array returned by :func:`state_sweep`.
+    """
+    if steps is not None:
+        states = utils.simulate(network.tpm, states, steps, seed)
+    states = [tuple(state) for state in states]
+
+    n = network.size
+    table = np.zeros(len(states), dtype=[('state', np.int8, (n,)),
+                                         ('phi', float),
+                                         ('main_complex', bool, (n,))])
+
+    subsets = _candidate_subsets(network)
+    relevant_nodes = _relevant_nodes(network, subsets)
+    cache = {}
+    for i, state in enumerate(states):
+        mip = _main_complex_branch_and_bound(network, state, subsets, cache,
+                                             relevant_nodes)
+        table['state'][i] = state
+        if mip is not None:
+            table['phi'][i] = mip.phi
+            table['main_complex'][i, list(mip.subsystem.node_indices)] = True
+        log.debug("Main complex at step {}: {}.".format(i, table[i]))
+
+    return table
+
+
+def resume(checkpoint):
+    """Resume a computation from a checkpoint file.
+
+    Finished subsystems and evaluated cuts are not recomputed.
+
+    Args:
+        checkpoint (str): A checkpoint file written by :func:`big_mip`,
+            :func:`complexes` or :func:`main_complex`.
+
+    Returns:
+        The result of the checkpointed computation.
+    """
+    task = Checkpoint.load(checkpoint).task
+    functions = {
+        'big_mip': big_mip,
+        'complexes': complexes,
+        'main_complex': main_complex,
+    }
+    return functions[task[0]](*task[1:], checkpoint=checkpoint)
+
+
 def condensed(network, state):
     """Return the set of maximal non-overlapping complexes."""
     condensed = []
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# compute/checkpoint.py
+
+"""
+Checkpoints of long-running |big_phi| computations.
+
+A checkpoint records the |BigMip| of every subsystem that has been finished,
+and, for the subsystem in progress, its unpartitioned constellation, the cuts
+that have been evaluated and the minimal |BigMip| found so far. It is
+periodically written to a file, from which the computation can be resumed
+with :func:`pyphi.compute.big_phi.resume`.
+"""
+
+import logging
+import os
+import pickle
+from collections import namedtuple
+from time import time
+
+from .. import config, constants
+
+# Create a logger for this module.
+log = logging.getLogger(__name__)
+
+
+_Progress = namedtuple('_Progress', ['unpartitioned_constellation',
+                                     'small_phi_time', 'evaluated_cuts',
+                                     'min_mip'])
+
+
+class Checkpoint:
+    """The progress of a |big_phi| computation, saved to a file.
+
+    Subsystems are identified by their digest, which, unlike their hash, is
+    the same in every process.
+
+    Args:
+        path (str): The file to save the checkpoint to.
+        task (tuple): The computation being checkpointed, as the name of the
+            function followed by its arguments.
+    """
+
+    def __init__(self, path, task):
+        self.path = path
+        self.task = task
+        self.results = {}
+        self.progress = {}
+        self._last_save = time()
+
+    @classmethod
+    def load(cls, path):
+        """Load a checkpoint from a file."""
+        with open(path, 'rb') as f:
+            checkpoint = pickle.load(f)
+        checkpoint.path = path
+        checkpoint._last_save = time()
+        return checkpoint
+
+    @classmethod
+    def open(cls, path, task):
+        """Load the checkpoint saved at ``path`` if there is one, and start a
+        new one otherwise.
+
+        Raises:
+            ValueError: If the saved checkpoint is of a different computation.
+        """
+        if not os.path.exists(path):
+            return cls(path, task)
+
+        checkpoint = cls.load(path)
+        if (len(checkpoint.task) != len(task) or
+                not all(a == b for a, b in zip(checkpoint.task, task))):
+            raise ValueError('The checkpoint at {} is of a different '
+                             'computation.'.format(path))
+        log.info('Resuming from checkpoint {}: {} subsystems finished.'.format(
+            path, len(checkpoint.results)))
+        return checkpoint
+
+    def save(self):
+        """Write the checkpoint to its file.
+
+        The file is replaced atomically, so an interrupted save leaves the
+        previous checkpoint intact.
+        """
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=constants.PICKLE_PROTOCOL)
+        os.replace(tmp_path, self.path)
+        self._last_save = time()
+        log.debug('Saved checkpoint {}.'.format(self.path))
+
+    def _save_if_due(self):
+        """Save the checkpoint if ``config.CHECKPOINT_INTERVAL`` seconds have
+        passed since it was last saved."""
+        if time() - self._last_save >= config.CHECKPOINT_INTERVAL:
+            self.save()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['path'], state['_last_save']
+        return state
+
+    def result(self, subsystem):
+        """Return the |BigMip| of a finished subsystem, or ``None``."""
+        return self.results.get(subsystem.digest)
+
+    def get_progress(self, subsystem):
+        """Return the progress of an unfinished subsystem, or ``None``."""
+        return self.progress.get(subsystem.digest)
+
+    def start(self, subsystem, unpartitioned_constellation, small_phi_time):
+        """Record that cuts of a subsystem are about to be evaluated."""
+        self.progress[subsystem.digest] = _Progress(
+            unpartitioned_constellation, small_phi_time, set(), None)
+        self._save_if_due()
+
+    def cut_evaluated(self, subsystem, cut, min_mip):
+        """Record that a cut of a subsystem has been evaluated, and the
+        minimal |BigMip| found so far."""
+        key = subsystem.digest
+        self.progress[key].evaluated_cuts.add(cut)
+        self.progress[key] = self.progress[key]._replace(min_mip=min_mip)
+        self._save_if_due()
+
+    def finish(self, subsystem, big_mip):
+        """Record the |BigMip| of a finished subsystem."""
+        key = subsystem.digest
+        self.progress.pop(key, None)
+        self.results[key] = big_mip
+        self._save_if_due()
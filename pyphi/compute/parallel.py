@@ -2,9 +2,22 @@
 # -*- coding: utf-8 -*-
 # compute/parallel.py
 
+import hashlib
+import io
+import logging
 import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
 
-from .. import config
+import numpy as np
+
+from .. import config, constants, utils
+
+# Create a logger for this module.
+log = logging.getLogger(__name__)
 
 
 # TODO: can return a negative number if NUMBER_OF_CORES
@@ -27,3 +40,335 @@ def get_num_processes():
         return cpu_count + config.NUMBER_OF_CORES + 1
 
     return config.NUMBER_OF_CORES
+
+
+def in_worker():
+    """Return whether this is running in a worker process.
+
+    Worker processes are daemonic, and cannot start workers of their own.
+    """
+    return multiprocessing.current_process().daemon
+
+
+# Arrays smaller than this (in bytes) are pickled as usual rather than shared.
+_SHARED_ARRAY_MIN_BYTES = 2 ** 12
+
+
+class _SharedArrayPickler(pickle.Pickler):
+    """Pickles large NumPy arrays by reference to a memory-mapped file in an
+    :class:`_ArrayStore` instead of by value."""
+
+    def __init__(self, file, store):
+        super().__init__(file, protocol=constants.PICKLE_PROTOCOL)
+        self.store = store
+        self.keys = set()
+
+    def persistent_id(self, obj):
+        if (type(obj) is np.ndarray and not obj.dtype.hasobject and
+                obj.nbytes >= _SHARED_ARRAY_MIN_BYTES):
+            key = self.store.put(obj)
+            self.keys.add(key)
+            return key
+        return None
+
+
+class _SharedArrayUnpickler(pickle.Unpickler):
+    """Resolves the array references written by :class:`_SharedArrayPickler` to
+    read-only views of the memory-mapped files.
+
+    ``views`` maps references to views that have already been loaded, and is
+    updated with those loaded by this unpickler.
+    """
+
+    def __init__(self, file, directory, views):
+        super().__init__(file)
+        self.directory = directory
+        self.views = views
+        self.loaded = set()
+
+    def persistent_load(self, key):
+        if key not in self.views:
+            path = os.path.join(self.directory, key)
+            self.views[key] = np.load(path, mmap_mode='r').view(np.ndarray)
+        self.loaded.add(key)
+        return self.views[key]
+
+
+class _ArrayStore:
+    """A directory of memory-mapped arrays, shared with worker processes.
+
+    Arrays are content-addressed, so an array (such as the TPM of a network)
+    which appears in the arguments of many jobs is written only once.
+    """
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix='pyphi-')
+        self._keys = set()
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.directory,
+                                           ignore_errors=True)
+
+    def put(self, array):
+        """Store an array, returning the name of its file."""
+        key = hashlib.sha1(repr((utils.np_hash(array), array.dtype.str,
+                                 array.shape)).encode()).hexdigest() + '.npy'
+        if key not in self._keys:
+            # Write to a temporary file first, so that workers never see a
+            # partially written array.
+            path = os.path.join(self.directory, key)
+            np.save(path + '.tmp', array, allow_pickle=False)
+            os.rename(path + '.tmp.npy', path)
+            self._keys.add(key)
+        return key
+
+    def dumps(self, obj):
+        """Pickle an object, storing its large arrays in shared memory.
+
+        Returns:
+            tuple[bytes, set[str]]: The pickled object and the names of the
+            arrays it refers to.
+        """
+        f = io.BytesIO()
+        pickler = _SharedArrayPickler(f, self)
+        pickler.dump(obj)
+        return f.getvalue(), pickler.keys
+
+    def prune(self, keys):
+        """Delete all arrays except those named in ``keys``.
+
+        Workers which have already mapped a deleted file can keep using it.
+        """
+        for key in self._keys - set(keys):
+            os.remove(os.path.join(self.directory, key))
+        self._keys &= set(keys)
+
+    def close(self):
+        """Delete the store."""
+        self._finalizer()
+
+
+def _loads(data, directory, views):
+    """Unpickle an object pickled by :meth:`_ArrayStore.dumps`.
+
+    Views that are not used by the object are dropped from ``views``.
+    """
+    unpickler = _SharedArrayUnpickler(io.BytesIO(data), directory, views)
+    obj = unpickler.load()
+    for key in set(views) - unpickler.loaded:
+        del views[key]
+    return obj
+
+
+# Sentinel telling a worker to exit.
+_SHUTDOWN = None
+
+# Outcomes of a task, returned by a worker along with the result.
+_DONE, _SKIPPED, _FAILED = range(3)
+
+
+def _reuse(old, new):
+    """Return ``old`` if it is equal to ``new``, and ``new`` otherwise."""
+    if type(old) is type(new) and old == new:
+        return old
+    return new
+
+
+def _worker(tasks, contexts, results, cancelled, directory):
+    """Evaluate tasks in a persistent worker process.
+
+    Tasks are ``(job, item)`` pairs taken from the shared ``tasks`` queue. The
+    function and shared arguments of each job are sent once per worker, on the
+    worker's own ``contexts`` queue, rather than with every item. Their large
+    arrays are mapped from the shared ``directory`` rather than copied. Shared
+    arguments that are equal to those of the previous job are replaced by the
+    worker's existing copies, so that their caches stay warm across jobs.
+
+    Items of jobs at or below the ``cancelled`` watermark are skipped.
+    """
+    job, context, function, args, views = -1, None, None, (), {}
+    while True:
+        task = tasks.get()
+        if task is _SHUTDOWN:
+            break
+        task_job, item = task
+
+        if task_job != job:
+            # Contexts arrive in job order; skip those of jobs for which this
+            # worker received no items.
+            while job < task_job:
+                job, context = contexts.get()
+            function = None
+
+        if task_job <= cancelled.value:
+            results.put((task_job, _SKIPPED, None))
+            continue
+
+        try:
+            if function is None:
+                function, job_config, job_args = _loads(context, directory,
+                                                        views)
+                config.load_config_dict(job_config)
+                if len(args) == len(job_args):
+                    args = tuple(map(_reuse, args, job_args))
+                else:
+                    args = job_args
+            results.put((task_job, _DONE, function(*(args + (item,)))))
+        except Exception as e:
+            # The arrays of a cancelled job may already have been deleted.
+            if task_job <= cancelled.value:
+                results.put((task_job, _SKIPPED, None))
+            else:
+                results.put((task_job, _FAILED, e))
+
+
+class WorkerPool:
+    """A pool of long-lived worker processes.
+
+    Unlike creating new processes for every computation, the workers are
+    started once and reused by every call to :meth:`imap_unordered`, so that
+    process startup is paid only once and per-worker caches persist between
+    computations. The outstanding items of a computation can be cancelled
+    without killing the workers. The workers are daemonic, so they are
+    terminated when the parent process exits.
+
+    The function and shared arguments of a computation are pickled once and
+    sent to each worker. Large NumPy arrays among them, such as TPMs and
+    repertoires, are not pickled but written to memory-mapped files, from
+    which the workers create read-only views. Only one computation can run at
+    a time: it must be exhausted or closed before the next one starts.
+
+    Args:
+        number_of_processes (int): The number of worker processes.
+    """
+
+    def __init__(self, number_of_processes):
+        self.number_of_processes = number_of_processes
+        self._tasks = multiprocessing.Queue()
+        self._results = multiprocessing.Queue()
+        self._cancelled = multiprocessing.Value('l', -1)
+        self._contexts = [multiprocessing.Queue()
+                          for i in range(number_of_processes)]
+        self._job = -1
+        self._running = False
+        self._store = _ArrayStore()
+        self._processes = [
+            multiprocessing.Process(target=_worker,
+                                    args=(self._tasks, contexts,
+                                          self._results, self._cancelled,
+                                          self._store.directory),
+                                    daemon=True)
+            for contexts in self._contexts
+        ]
+        for process in self._processes:
+            process.start()
+
+    def imap_unordered(self, function, items, *args):
+        """Apply ``function(*args, item)`` to each item in the worker
+        processes.
+
+        Results are yielded in the order they are computed. If the generator
+        is closed before it is exhausted, the remaining items are cancelled.
+
+        Args:
+            function (Callable): A picklable function.
+            items (Iterable): The items to apply the function to.
+            *args: Arguments shared by all items. These are sent to each
+                worker only once.
+
+        Yields:
+            The result of the function for each item.
+
+        Raises:
+            RuntimeError: If another computation of the pool is running.
+            Exception: Any exception raised by the function in a worker. The
+                remaining items are cancelled.
+        """
+        if self._running:
+            raise RuntimeError(
+                'Another computation is running in the worker pool. Exhaust '
+                'or close its results before starting a new one.')
+        self._running = True
+        self._job += 1
+        job = self._job
+        remaining = 0
+
+        try:
+            context, keys = self._store.dumps(
+                (function,
+                 {key: getattr(config, key) for key in config.DEFAULTS},
+                 args))
+            # Arrays of earlier jobs are no longer needed.
+            self._store.prune(keys)
+            for contexts in self._contexts:
+                contexts.put((job, context))
+
+            for item in items:
+                self._tasks.put((job, item))
+                remaining += 1
+
+            while remaining:
+                result_job, outcome, result = self._results.get()
+                # Discard results of earlier, cancelled jobs.
+                if result_job != job:
+                    continue
+                remaining -= 1
+                if outcome == _FAILED:
+                    raise result
+                if outcome == _DONE:
+                    yield result
+        finally:
+            if remaining:
+                self.cancel()
+            self._running = False
+
+    def cancel(self):
+        """Cancel the outstanding items of the current computation.
+
+        Items which are already being evaluated run to completion, but their
+        results are discarded.
+        """
+        self._cancelled.value = self._job
+
+    def close(self):
+        """Stop the worker processes and delete the shared arrays."""
+        self.cancel()
+        for process in self._processes:
+            self._tasks.put(_SHUTDOWN)
+        for process in self._processes:
+            process.join()
+        self._store.close()
+
+    def alive(self):
+        """Return whether all worker processes are running."""
+        return all(process.is_alive() for process in self._processes)
+
+
+_pool = None
+
+
+def get_pool():
+    """Return the shared :class:`WorkerPool`, starting it if necessary.
+
+    The pool is restarted if ``config.NUMBER_OF_CORES`` has changed or a
+    worker has died.
+    """
+    global _pool
+
+    number_of_processes = get_num_processes()
+    if (_pool is None or _pool.number_of_processes != number_of_processes or
+            not _pool.alive()):
+        shutdown_pool()
+        log.debug('Starting pool of {} worker processes.'.format(
+            number_of_processes))
+        _pool = WorkerPool(number_of_processes)
+
+    return _pool
+
+
+def shutdown_pool():
+    """Stop the shared :class:`WorkerPool`, if it is running."""
+    global _pool
+
+    if _pool is not None:
+        if _pool.alive():
+            _pool.close()
+        _pool = None
@@ -16,7 +16,7 @@ from collections import namedtuple
 import numpy as np
 from marbl import MarblSet
 
-from . import config, convert, db, models
+from . import config, convert, db, models, utils
 from .constants import DIRECTIONS, FUTURE, PAST
 
 
@@ -135,6 +135,17 @@ class NormalizedMechanism:
     def __eq__(self, other):
         return hash(self) == hash(other)
 
+    @property
+    def digest(self):
+        """str: The key of this mechanism in the concept database. See
+        :func:`pyphi.utils.digest`."""
+        # The normalized TPMs of the marbls, in the order ``outputs`` refers
+        # to.
+        marbls = [(marbl.node_tpm, marbl.augmented_child_tpms)
+                  for marbl in self.marblset]
+        return utils.digest(('NormalizedMechanism', marbls, self.outputs,
+                             self.state, self.io_state))
+
     def __str__(self):
         return str(self.indices)
 
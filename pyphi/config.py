@@ -75,6 +75,30 @@ long time!), resulting in data loss.
     ``main_complex``, etc.) ``PARALLEL_CUT_EVALUATION`` will be fastest. Use
     ``PARALLEL_CONCEPT_EVALUATION`` if you are only computing constellations.
 
+- ``pyphi.config.PARALLEL_COMPLEX_EVALUATION``: Control whether the candidate
+  subsystems of ``complexes``, ``main_complex`` and ``iter_complexes`` are
+  evaluated in parallel. Each subsystem's cuts are then evaluated
+  sequentially in its worker. Computations that are saved to a checkpoint are
+  always evaluated sequentially.
+
+    >>> defaults['PARALLEL_COMPLEX_EVALUATION']
+    False
+
+- ``pyphi.config.PARALLEL_STATE_EVALUATION``: Control whether the states
+  passed to ``state_sweep`` are evaluated in parallel. The subsystems and cuts
+  of each state are then evaluated sequentially in its worker.
+
+    >>> defaults['PARALLEL_STATE_EVALUATION']
+    True
+
+- ``pyphi.config.PARALLEL_MACRO_EVALUATION``: Control whether the candidate
+  macro-systems considered by ``macro.emergence``, ``macro.coarse_grain`` and
+  ``macro.phi_by_grain`` are evaluated in parallel. The cuts of each
+  macro-system are then evaluated sequentially in its worker.
+
+    >>> defaults['PARALLEL_MACRO_EVALUATION']
+    False
+
 - ``pyphi.config.NUMBER_OF_CORES``: Control the number of CPU cores used to
   evaluate unidirectional cuts. Negative numbers count backwards from the total
   number of available cores, with ``-1`` meaning "use all available cores."
@@ -82,6 +106,41 @@ long time!), resulting in data loss.
     >>> defaults['NUMBER_OF_CORES']
     -1
 
+- ``pyphi.config.VECTORIZED_MIP_EVALUATION``: Control whether the distances
+  between a mechanism's unpartitioned repertoire and all of its partitioned
+  repertoires are computed in a single batch when finding the MIP, rather than
+  one partition at a time. This applies to effect repertoires and, if
+  ``L1_DISTANCE_APPROXIMATION`` is enabled, to cause repertoires. Results are
+  the same, up to floating-point rounding in the last decimal place.
+
+    >>> defaults['VECTORIZED_MIP_EVALUATION']
+    False
+
+- ``pyphi.config.SKIP_SYMMETRIC_CUTS``: Control whether only one cut of each
+  set of cuts that are equivalent under a symmetry of the subsystem is
+  evaluated when finding the |big_phi| MIP. Symmetries are permutations of the
+  subsystem's nodes that preserve its TPM, connectivity matrix and state;
+  equivalent cuts have the same |big_phi|, so the result is unchanged.
+  Finding the symmetries has a cost of its own for every subsystem, so this is
+  disabled by default.
+
+    >>> defaults['SKIP_SYMMETRIC_CUTS']
+    False
+
+- ``pyphi.config.CUT_ORDERING``: The order in which cuts are evaluated when
+  finding the |big_phi| MIP. The search stops as soon as a cut with zero
+  |big_phi| is found, so trying likely candidates first saves time for
+  reducible subsystems. ``'none'`` evaluates cuts in the order of
+  :func:`~pyphi.compute.big_phi.big_mip_bipartitions`;
+  ``'severed_connections'`` evaluates cuts that sever fewer connections first;
+  ``'damaged_concepts'`` evaluates cuts that damage fewer concepts of the
+  unpartitioned constellation first. Other strategies can be registered in
+  :data:`pyphi.compute.big_phi.CUT_ORDERINGS`. If several cuts have the
+  minimal |big_phi|, which of them is returned depends on the ordering.
+
+    >>> defaults['CUT_ORDERING']
+    'none'
+
 - ``pyphi.config.MAXIMUM_CACHE_MEMORY_PERCENTAGE``: PyPhi employs several
   in-memory caches to speed up computation. However, these can quickly use a
   lot of memory for large networks or large numbers of them; to avoid
@@ -91,6 +150,24 @@ long time!), resulting in data loss.
     >>> defaults['MAXIMUM_CACHE_MEMORY_PERCENTAGE']
     50
 
+- ``pyphi.config.MAXIMUM_CACHE_BYTES``: The maximum number of bytes that the
+  in-memory caches of repertoires, |Mice| and purviews of a process can hold
+  together. The size of every cached value is tracked, and the least recently
+  used values of all caches are evicted to make room for new ones. If
+  ``None``, the caches can hold ``MAXIMUM_CACHE_MEMORY_PERCENTAGE`` of
+  physical memory.
+
+    >>> defaults['MAXIMUM_CACHE_BYTES'] is None
+    True
+
+- ``pyphi.config.CHECKPOINT_INTERVAL``: The minimum number of seconds between
+  saves of a checkpoint, when a checkpoint file is passed to ``big_mip``,
+  ``complexes`` or ``main_complex``. Saving a checkpoint pickles every
+  |BigMip| computed so far, so it should not be done too often.
+
+    >>> defaults['CHECKPOINT_INTERVAL']
+    60
+
 Caching
 ~~~~~~~
 
@@ -158,6 +235,23 @@ relying on the cache. For this reason it is disabled by default.
     >>> defaults['REDIS_CACHE']
     False
 
+- ``pyphi.config.SHARED_MICE_CACHE``: Specifies whether |Mice| are shared
+  between the worker processes of parallel computations, and between the cuts
+  of a subsystem, through files in a temporary directory. This does not
+  require a server, and takes precedence over the local cache but not over
+  Redis.
+
+    >>> defaults['SHARED_MICE_CACHE']
+    False
+
+- ``pyphi.config.PERSISTENT_MICE_CACHE``: Specifies whether |Mice| are stored
+  in an SQLite database in ``FS_CACHE_DIRECTORY``, so that they are reused by
+  later computations. Any number of processes can use the database at once.
+  This takes precedence over ``SHARED_MICE_CACHE`` but not over Redis.
+
+    >>> defaults['PERSISTENT_MICE_CACHE']
+    False
+
 - ``pyphi.config.REDIS_CONFIG``: Configure the Redis database backend. These
     are the defaults in the provided ``redis.conf`` file.
 
@@ -174,6 +268,17 @@ logs and the name of the log file. Logs can be written to standard output, a
 file, both, or none. See the `documentation on Python's logger
 <https://docs.python.org/3.4/library/logging.html>`_ for more information.
 
+PyPhi does not configure logging unless asked to, so that importing it has no
+side effects. Call ``pyphi.config.configure_logging()`` to install the handlers
+described by ``LOGGING_CONFIG`` on the root logger, or enable
+``CONFIGURE_LOGGING_ON_IMPORT`` to do so when PyPhi is imported.
+
+- ``pyphi.config.CONFIGURE_LOGGING_ON_IMPORT``: Control whether logging is
+  configured with ``LOGGING_CONFIG`` when PyPhi is imported.
+
+    >>> defaults['CONFIGURE_LOGGING_ON_IMPORT']
+    False
+
 - ``pyphi.config.LOGGING_CONFIG['file']['enabled']``: Control whether logs are
   written to a file.
 
@@ -206,7 +311,8 @@ file, both, or none. See the `documentation on Python's logger
     'WARNING'
 
 - ``pyphi.config.LOG_CONFIG_ON_IMPORT``: Controls whether the current
-  configuration is printed when PyPhi is imported.
+  configuration is logged when PyPhi is imported, if logging is configured to
+  record ``INFO`` messages.
 
     >>> defaults['LOG_CONFIG_ON_IMPORT']
     True
@@ -227,6 +333,20 @@ Numerical precision
     >>> defaults['PRECISION']
     6
 
+- ``pyphi.config.HAMMING_EMD_SOLVER``: The solver used for the EMD between
+  cause repertoires and in concept distances, where the ground distance is the
+  Hamming distance between states. ``'pyemd'`` solves the dense
+  |2^N x 2^N| transportation problem with an external C++ library.
+  ``'hypercube'`` instead solves a minimum-cost flow over the edges of the
+  hypercube of states (see :func:`pyphi.utils.hypercube_emd`). It does not
+  require precomputed Hamming matrices and is much faster for distributions
+  over many nodes, but slower for small ones. It is also exact, whereas
+  ``pyemd`` is accurate to about ``10e-PRECISION``, so results may differ in
+  the last decimal place.
+
+    >>> defaults['HAMMING_EMD_SOLVER']
+    'pyemd'
+
 
 Miscellaneous
 ~~~~~~~~~~~~~
@@ -290,11 +410,32 @@ DEFAULTS = {
     # memory. If cuts are evaluated sequentially, only two BigMips need to be
     # in memory at a time.
     'PARALLEL_CUT_EVALUATION': True,
+    # Controls whether candidate subsystems are evaluated in parallel when
+    # searching for complexes.
+    'PARALLEL_COMPLEX_EVALUATION': False,
+    # Controls whether states are evaluated in parallel by `state_sweep`.
+    'PARALLEL_STATE_EVALUATION': True,
+    # Controls whether candidate macro-systems are evaluated in parallel when
+    # searching for emergence.
+    'PARALLEL_MACRO_EVALUATION': False,
     # The number of CPU cores to use in parallel cut evaluation. -1 means all
     # available cores, -2 means all but one available cores, etc.
     'NUMBER_OF_CORES': -1,
+    # Controls whether the distances to all partitioned repertoires are
+    # computed in a single batch when finding MIPs.
+    'VECTORIZED_MIP_EVALUATION': False,
+    # Controls whether cuts that are equivalent under a symmetry of the
+    # subsystem are skipped when finding the MIP.
+    'SKIP_SYMMETRIC_CUTS': False,
+    # The order in which cuts are evaluated when finding the MIP.
+    'CUT_ORDERING': 'none',
     # The maximum percentage of RAM that PyPhi should use for caching.
     'MAXIMUM_CACHE_MEMORY_PERCENTAGE': 50,
+    # The maximum number of bytes that all in-memory caches share. `None`
+    # means `MAXIMUM_CACHE_MEMORY_PERCENTAGE` of physical memory.
+    'MAXIMUM_CACHE_BYTES': None,
+    # The minimum number of seconds between saves of a checkpoint.
+    'CHECKPOINT_INTERVAL': 60,
     # Controls whether BigMips are cached and retreived.
     'CACHE_BIGMIPS': False,
     # Controls whether the potential purviews of the mechanisms of a network
@@ -317,6 +458,10 @@ DEFAULTS = {
     },
     # Use Redis to cache Mice
     'REDIS_CACHE': False,
+    # Share Mice between worker processes and cuts through temporary files
+    'SHARED_MICE_CACHE': False,
+    # Store Mice in an SQLite database in `FS_CACHE_DIRECTORY`
+    'PERSISTENT_MICE_CACHE': False,
     # Redis configuration
     'REDIS_CONFIG': {
         'host': 'localhost',
@@ -336,10 +481,14 @@ DEFAULTS = {
             'level': 'WARNING'
         }
     },
+    # Controls whether logging is configured when PyPhi is imported.
+    'CONFIGURE_LOGGING_ON_IMPORT': False,
     # Controls whether the current configuration is logged upon import.
     'LOG_CONFIG_ON_IMPORT': True,
     # The number of decimal points to which phi values are considered accurate.
     'PRECISION': 6,
+    # The solver to use for EMDs with a Hamming ground distance.
+    'HAMMING_EMD_SOLVER': 'pyemd',
     # Controls whether a subsystem's state is validated when the subsystem is
     # created.
     'VALIDATE_SUBSYSTEM_STATES': True,
@@ -356,6 +505,13 @@ DEFAULTS = {
 # directly in the `pyphi.config` namespace
 this_module = sys.modules[__name__]
 
+# Options which change the results of computations, rather than how they are
+# carried out. Their values are part of the keys of persistent caches.
+_RESULT_OPTIONS = ('ASSUME_CUTS_CANNOT_CREATE_NEW_CONCEPTS',
+                   'CUT_ONE_APPROXIMATION', 'HAMMING_EMD_SOLVER',
+                   'L1_DISTANCE_APPROXIMATION', 'PRECISION',
+                   'SINGLE_NODES_WITH_SELFLOOPS_HAVE_PHI')
+
 
 def load_config_dict(config):
     """Load configuration values.
@@ -383,11 +539,50 @@ def get_config_string():
     return pprint.pformat(config, indent=2)
 
 
+def result_options():
+    """Return the current values of the options which change the results of
+    computations, as a tuple of ``(name, value)`` pairs."""
+    return tuple((key, this_module.__dict__[key]) for key in _RESULT_OPTIONS)
+
+
 def print_config():
     """Print the current configuration."""
     print('Current PyPhi configuration:\n', get_config_string())
 
 
+def configure_logging():
+    """Configure the root logger with the handlers in ``LOGGING_CONFIG``."""
+    import logging.config
+
+    logging.config.dictConfig({
+        'version': 1,
+        'disable_existing_loggers': False,
+        'formatters': {
+            'standard': {
+                'format': LOGGING_CONFIG['format']
+            }
+        },
+        'handlers': {
+            'file': {
+                'level': LOGGING_CONFIG['file']['level'],
+                'class': 'logging.FileHandler',
+                'filename': LOGGING_CONFIG['file']['filename'],
+                'formatter': 'standard',
+            },
+            'stdout': {
+                'level': LOGGING_CONFIG['stdout']['level'],
+                'class': 'logging.StreamHandler',
+                'formatter': 'standard',
+            }
+        },
+        'root': {
+            'level': 'DEBUG',
+            'handlers': [h for h in ['file', 'stdout'] if
+                         LOGGING_CONFIG[h]['enabled']]
+        }
+    })
+
+
 class override(contextlib.ContextDecorator):
     """Decorator and context manager to override config values.
 
@@ -8,8 +8,6 @@ Package-wide constants.
 
 import pickle
 
-import joblib
-
 from . import config
 
 # The threshold below which we consider differences in phi values to be
@@ -26,7 +24,24 @@ FILESYSTEM = 'fs'
 DATABASE = 'db'
 # The protocol used for pickling objects.
 PICKLE_PROTOCOL = pickle.HIGHEST_PROTOCOL
+
+
+class _LazyJoblibMemory:
+    """A joblib Memory object that is only created when it is first used, so
+    that joblib is not imported and the cache directory is not created when
+    PyPhi is imported."""
+
+    def __init__(self):
+        self._memory = None
+
+    def __getattr__(self, name):
+        if self._memory is None:
+            import joblib
+            self._memory = joblib.Memory(cachedir=config.FS_CACHE_DIRECTORY,
+                                         verbose=config.FS_CACHE_VERBOSITY)
+        return getattr(self._memory, name)
+
+
 # Create the joblib Memory object for persistent caching without a
 # database.
-joblib_memory = joblib.Memory(cachedir=config.FS_CACHE_DIRECTORY,
-                              verbose=config.FS_CACHE_VERBOSITY)
+joblib_memory = _LazyJoblibMemory()
@@ -173,20 +173,16 @@ def state_by_state2state_by_node(tpm):
     S = tpm.shape[-1]
     # Get the number of nodes from the number of states.
     N = int(math.log(S, 2))
-    # Initialize the new state-by node TPM.
-    sbn_tpm = np.zeros(([2] * N + [N]))
-    # Map indices to state-tuples with the LOLI convention.
-    states = {i: loli_index2state(i, N) for i in range(S)}
     # Get an array for each node with 1 in positions that correspond to that
     # node being on in the next state, and a 0 otherwise.
-    node_on = np.array([[states[i][n] for i in range(S)] for n in range(N)])
-    on_probabilities = [tpm * node_on[n] for n in range(N)]
-    for i, state in states.items():
-        # Get the probability of each node being on given the past state i,
-        # i.e., a row of the state-by-node TPM.
-        # Assign that row to the ith state in the state-by-node TPM.
-        sbn_tpm[state] = [np.sum(on_probabilities[n][i]) for n in range(N)]
-    return sbn_tpm
+    node_on = _loli_bits(N).T
+    # The probability of each node being on given each past state is the sum
+    # of the probabilities of the next states in which it is on. The rows are
+    # the past states, in LOLI order.
+    sbn_tpm = np.empty((S, N))
+    for n in range(N):
+        sbn_tpm[:, n] = np.sum(tpm * node_on[n], axis=-1)
+    return to_n_dimensional(sbn_tpm)
 
 
 # TODO support nondeterministic TPMs
@@ -243,25 +239,32 @@ def state_by_node2state_by_state(tpm):
     N = tpm.shape[-1]
     # Get the number of states.
     S = 2**N
-    # Initialize the state-by-state TPM.
-    sbs_tpm = np.zeros((S, S))
+    # Get the rows of the TPM, with the past states in LOLI order.
+    tpm = tpm.reshape([S, N], order='F')
+    # Get the state of each node in each current state, in LOLI order.
+    bits = _loli_bits(N)
     if not np.any(np.logical_and(tpm < 1, tpm > 0)):
         # TPM is deterministic.
-        for past_state_index in range(S):
-            # Use the LOLI convention to get the row and column indices.
-            past_state = loli_index2state(past_state_index, N)
-            current_state_index = state2loli_index(tpm[past_state])
-            sbs_tpm[past_state_index, current_state_index] = 1
+        sbs_tpm = np.zeros((S, S))
+        # Use the LOLI convention to get the column indices.
+        current_state_indices = np.dot(tpm.astype(int), 1 << np.arange(N))
+        sbs_tpm[np.arange(S), current_state_indices] = 1
     else:
-        # TPM is nondeterministic.
-        for past_state_index in range(S):
-            # Use the LOLI convention to get the row and column indices.
-            past_state = loli_index2state(past_state_index, N)
-            marginal_tpm = tpm[past_state]
-            for current_state_index in range(S):
-                current_state = np.array(
-                    [i for i in loli_index2state(current_state_index, N)])
-                sbs_tpm[past_state_index, current_state_index] = (
-                    np.prod(marginal_tpm[current_state == 1]) *
-                    np.prod(1 - marginal_tpm[current_state == 0]))
+        # TPM is nondeterministic. The probability of a current state is the
+        # product of the probabilities of the nodes that are on, times the
+        # product of the probabilities of the nodes that are off.
+        on_probability = np.ones((S, S))
+        off_probability = np.ones((S, S))
+        for n in range(N):
+            on = bits[:, n] == 1
+            on_probability[:, on] *= tpm[:, n, np.newaxis]
+            off_probability[:, ~on] *= 1 - tpm[:, n, np.newaxis]
+        sbs_tpm = on_probability * off_probability
     return sbs_tpm
+
+
+def _loli_bits(number_of_nodes):
+    """Return an array whose |ith| row is the state of the network with
+    **LOLI** index |i|."""
+    indices = np.arange(2**number_of_nodes)[:, np.newaxis]
+    return (indices >> np.arange(number_of_nodes)) & 1
@@ -9,10 +9,7 @@ Interface to MongoDB that exposes it as a key-value store.
 import pickle
 from collections import Iterable
 
-import pymongo
-from bson.binary import Binary
-
-from . import config, constants
+from . import config, constants, utils
 
 KEY_FIELD = 'k'
 VALUE_FIELD = 'v'
@@ -22,6 +19,9 @@ VALUE_FIELD = 'v'
 client, database, collection = None, None, None
 # Connect to MongoDB if the caching backend is set to 'db'.
 if config.CACHING_BACKEND == 'db':
+    # pymongo is only imported if the database is used.
+    import pymongo
+
     # TODO!!! use reconnect proxy
     client = pymongo.MongoClient(config.MONGODB_CONFIG['host'],
                                  config.MONGODB_CONFIG['port'])
@@ -49,6 +49,9 @@ def insert(key, value):
     """Store a value with a key.
 
     If the key is already present in the database, this does nothing."""
+    import pymongo
+    from bson.binary import Binary
+
     # Pickle the value.
     value = pickle.dumps(value, protocol=constants.PICKLE_PROTOCOL)
     # Store the value as binary data in a document.
@@ -69,10 +72,11 @@ def generate_key(filtered_args):
     """Get a key from some input.
 
     This function should be used whenever a key is needed, to keep keys
-    consistent."""
+    consistent. Keys are stable digests (see :func:`pyphi.utils.digest`), so
+    they can be reused by other processes."""
     # Convert the value to a (potentially singleton) tuple to be consistent
     # with joblib.filtered_args.
     if isinstance(filtered_args, Iterable):
-        return hash(tuple(filtered_args))
+        return utils.digest(tuple(filtered_args))
     else:
-        return hash((filtered_args, ))
+        return utils.digest((filtered_args, ))
@@ -13,6 +13,7 @@ import logging
 import numpy as np
 
 from . import compute, config, constants, convert, utils, validate
+from .compute import parallel
 from .network import irreducible_purviews
 from .node import expand_node_tpm, generate_nodes
 from .subsystem import Subsystem
@@ -20,11 +21,6 @@ from .subsystem import Subsystem
 # Create a logger for this module.
 log = logging.getLogger(__name__)
 
-# Load precomputed partition lists.
-_NUM_PRECOMPUTED_PARTITION_LISTS = 10
-_partition_lists = utils.load_data('partition_lists',
-                                   _NUM_PRECOMPUTED_PARTITION_LISTS)
-
 
 class ConditionallyDependentError(ValueError):
     pass
@@ -117,15 +113,6 @@ class MacroSubsystem(Subsystem):
         # ================
         self.nodes = generate_nodes(self, self.node_indices)
 
-        # Hash the final subsystem - only compute hash once.
-        self._hash = hash((self.network,
-                           self.cut,
-                           self._network_state,
-                           self._node_indices,
-                           self._time_scale,
-                           self._blackbox,
-                           self._coarse_grain))
-
         validate.subsystem(self)
 
     def _squeeze(self, internal_indices):
@@ -311,6 +298,13 @@ class MacroSubsystem(Subsystem):
     def __hash__(self):
         return self._hash
 
+    def _digest_content(self):
+        """Identify the subsystem by the arguments it was built from, which
+        are set before ``Subsystem.__init__`` computes the digest."""
+        return ('MacroSubsystem', self.network, self.cut, self._network_state,
+                self._node_indices, self._time_scale, self._blackbox,
+                self._coarse_grain)
+
 
 class CoarseGrain(namedtuple('CoarseGrain', ['partition', 'grouping'])):
     """Represents a coarse graining of a collection of nodes.
@@ -399,14 +393,22 @@ class CoarseGrain(namedtuple('CoarseGrain', ['partition', 'grouping'])):
             |ith| entry in the mapping is the macro-state corresponding to the
             |ith| micro-state.
         """
-        micro_states = utils.all_states(len(self.micro_indices))
+        reindexed = self.reindex()
+
+        # The state of each micro node in each micro-state, with the
+        # micro-states in LOLI order.
+        n = len(self.micro_indices)
+        micro_states = (np.arange(2**n)[:, np.newaxis] >> np.arange(n)) & 1
 
         # Find the corresponding macro-state for each micro-state.
-        # The i-th entry in the mapping is the macro-state corresponding to the
-        # i-th micro-state.
-        mapping = [convert.state2loli_index(self.macro_state(micro_state))
-                   for micro_state in micro_states]
-        return np.array(mapping)
+        # The i-th entry in the mapping is the LOLI index of the macro-state
+        # corresponding to the i-th micro-state.
+        mapping = np.zeros(2**n, dtype=int)
+        for i in self.macro_indices:
+            num_on = micro_states[:, list(reindexed.partition[i])].sum(1)
+            macro_node_off = np.in1d(num_on, self.grouping[i][0])
+            mapping[~macro_node_off] += 1 << i
+        return mapping
 
     def macro_tpm(self, micro_tpm, check_independence=True):
         """Create a coarse-grained macro TPM.
@@ -428,17 +430,17 @@ class CoarseGrain(namedtuple('CoarseGrain', ['partition', 'grouping'])):
         mapping = self.make_mapping()
 
         num_macro_states = 2 ** len(self.macro_indices)
-        macro_tpm = np.zeros((num_macro_states, num_macro_states))
-
-        micro_states = range(2 ** len(self.micro_indices))
-        micro_state_transitions = itertools.product(micro_states, micro_states)
 
         # For every possible micro-state transition, get the corresponding past
         # and current macro-state using the mapping and add that probability to
-        # the state-by-state macro TPM.
-        for past_state, current_state in micro_state_transitions:
-            macro_tpm[mapping[past_state], mapping[current_state]] += (
-                micro_tpm[past_state, current_state])
+        # the state-by-state macro TPM. The probabilities are summed in the
+        # order of the micro-state transitions.
+        transitions = (mapping[:, np.newaxis] * num_macro_states +
+                       mapping[np.newaxis, :])
+        macro_tpm = np.bincount(transitions.ravel(),
+                                weights=micro_tpm.ravel(),
+                                minlength=num_macro_states**2).reshape(
+                                    num_macro_states, num_macro_states)
 
         # Re-normalize each row because we're going from larger to smaller TPM
         macro_tpm = np.array([utils.normalize(row) for row in macro_tpm])
@@ -527,46 +529,95 @@ class Blackbox(namedtuple('Blackbox', ['partition', 'output_indices'])):
         return False
 
 
-def _partitions_list(N):
-    """Return a list of partitions of the |N| binary nodes.
+def _partitions(N, max_blocks=None, max_block_size=None):
+    """Generate the partitions of the |N| binary nodes.
+
+    Partitions are generated lazily, as restricted growth strings in
+    lexicographic order, so any number of nodes can be partitioned in constant
+    memory. The partition into a single block is skipped, unless ``N == 1``.
 
     Args:
         N (int): The number of nodes under consideration.
 
-    Returns:
+    Keyword Args:
+        max_blocks (int): If given, only partitions with at most this many
+            blocks are generated.
+        max_block_size (int): If given, only partitions whose blocks have at
+            most this many elements are generated.
+
+    Yields:
         list[list]: A list of lists, where each inner list is the set of
         micro-elements corresponding to a macro-element.
 
     Example:
-        >>> _partitions_list(3)
+        >>> list(_partitions(3))
         [[[0, 1], [2]], [[0, 2], [1]], [[0], [1, 2]], [[0], [1], [2]]]
+        >>> list(_partitions(3, max_block_size=1))
+        [[[0], [1], [2]]]
     """
-    if N < (_NUM_PRECOMPUTED_PARTITION_LISTS):
-        return list(_partition_lists[N])
-    else:
-        raise ValueError(
-            'Partition lists not yet available for system with {} '
-            'nodes or more'.format(_NUM_PRECOMPUTED_PARTITION_LISTS))
-
-
-def all_partitions(indices):
+    if N == 0:
+        return
+    if max_blocks is None:
+        max_blocks = N
+    if max_block_size is None:
+        max_block_size = N
+
+    blocks = []
+
+    def fits(i):
+        # Whether the remaining elements `i..N-1` fit in the free space.
+        free = (sum(max_block_size - len(block) for block in blocks) +
+                (max_blocks - len(blocks)) * max_block_size)
+        return free >= N - i
+
+    def extend(i):
+        # Put element `i` in each existing block, then in a new block.
+        if i == N:
+            if len(blocks) > 1 or N == 1:
+                yield [list(block) for block in blocks]
+            return
+        for block in blocks:
+            if len(block) < max_block_size:
+                block.append(i)
+                if fits(i + 1):
+                    yield from extend(i + 1)
+                block.pop()
+        if len(blocks) < max_blocks:
+            blocks.append([i])
+            if fits(i + 1):
+                yield from extend(i + 1)
+            blocks.pop()
+
+    yield from extend(0)
+
+
+def all_partitions(indices, max_blocks=None, max_block_size=None):
     """Return a list of all possible coarse grains of a network.
 
     Args:
         indices (tuple[int]): The micro indices to partition.
 
+    Keyword Args:
+        max_blocks (int): If given, only partitions into at most this many
+            macro-elements are generated.
+        max_block_size (int): If given, only partitions whose macro-elements
+            have at most this many micro-elements are generated.
+
     Yields:
         tuple[tuple]: A possible partition. Each element of the tuple
         is a tuple of micro-elements which correspond to macro-elements.
     """
     n = len(indices)
-    partitions = _partitions_list(n)
-    if n > 0:
-        partitions[-1] = [list(range(n))]
 
-    for partition in partitions:
-        yield tuple(tuple(indices[i] for i in part)
-                    for part in partition)
+    # The partition into singletons is not a coarse-graining; the partition
+    # into a single macro-element is generated last instead.
+    for partition in _partitions(n, max_blocks, max_block_size):
+        if len(partition) < n:
+            yield tuple(tuple(indices[i] for i in part)
+                        for part in partition)
+
+    if n > 0 and (max_block_size is None or n <= max_block_size):
+        yield (tuple(indices),)
 
 
 def all_groupings(partition):
@@ -587,25 +638,31 @@ def all_groupings(partition):
         raise ValueError('Each part of the partition must have at least one '
                          'element.')
 
-    micro_groupings = [_partitions_list(len(part) + 1) if len(part) > 1
-                       else [[[0], [1]]] for part in partition]
+    micro_groupings = [list(_partitions(len(part) + 1, max_blocks=2))
+                       if len(part) > 1 else [[[0], [1]]]
+                       for part in partition]
 
     for grouping in itertools.product(*micro_groupings):
-        if all(len(element) < 3 for element in grouping):
-            yield tuple(tuple(tuple(tuple(state) for state in states)
-                        for states in grouping))
+        yield tuple(tuple(tuple(tuple(state) for state in states)
+                    for states in grouping))
 
 
-def all_coarse_grains(indices):
+def all_coarse_grains(indices, max_blocks=None, max_block_size=None):
     """Generator over all possible ``CoarseGrains`` of these indices.
 
     Args:
         indices (tuple[int]): Node indices to coarse grain.
 
+    Keyword Args:
+        max_blocks (int): The maximum number of macro-elements. See
+            :func:`all_partitions`.
+        max_block_size (int): The maximum number of micro-elements in a
+            macro-element. See :func:`all_partitions`.
+
     Yields:
         CoarseGrain: The next coarse-grain for ``indices``.
     """
-    for partition in all_partitions(indices):
+    for partition in all_partitions(indices, max_blocks, max_block_size):
         for grouping in all_groupings(partition):
             yield CoarseGrain(partition, grouping)
 
@@ -697,26 +754,17 @@ def coarse_grain(network, state, internal_indices):
     Returns:
         tuple[int, CoarseGrain]: The phi-value of the maximal CoarseGrain.
     """
-    max_phi = float('-inf')
-    max_coarse_grain = CoarseGrain((), ())
+    candidates = ((internal_indices, 1, None, coarse_grain)
+                  for coarse_grain in all_coarse_grains(internal_indices))
+    max_phi, max_candidate = _max_macro_phi(network, state, candidates)
+    if max_candidate is None:
+        return (max_phi, CoarseGrain((), ()))
+    return (max_phi, max_candidate[3])
 
-    for coarse_grain in all_coarse_grains(internal_indices):
-        try:
-            subsystem = MacroSubsystem(network, state, internal_indices,
-                                       coarse_grain=coarse_grain)
-        except ConditionallyDependentError:
-            continue
 
-        phi = compute.big_phi(subsystem)
-        if (phi - max_phi) > constants.EPSILON:
-            max_phi = phi
-            max_coarse_grain = coarse_grain
-
-    return (max_phi, max_coarse_grain)
-
-
-def all_macro_systems(network, state, blackbox, coarse_grain, time_scales):
-    """Generator over all possible macro-systems for the network."""
+def _macro_system_candidates(network, blackbox, coarse_grain, time_scales):
+    """Generator over the arguments of all possible macro-systems for the
+    network, as ``(system, time_scale, blackbox, coarse_grain)`` tuples."""
 
     if time_scales is None:
         time_scales = [1]
@@ -739,15 +787,77 @@ def all_macro_systems(network, state, blackbox, coarse_grain, time_scales):
         for time_scale in time_scales:
             for blackbox in blackboxes(system):
                 for coarse_grain in coarse_grains(blackbox, system):
-                    try:
-                        yield MacroSubsystem(
-                            network, state, system,
-                            time_scale=time_scale,
-                            blackbox=blackbox,
-                            coarse_grain=coarse_grain)
-                    except (validate.StateUnreachableError,
-                            ConditionallyDependentError):
-                        continue
+                    yield (system, time_scale, blackbox, coarse_grain)
+
+
+def all_macro_systems(network, state, blackbox, coarse_grain, time_scales):
+    """Generator over all possible macro-systems for the network."""
+    for system, time_scale, blackbox, coarse_grain in _macro_system_candidates(
+            network, blackbox, coarse_grain, time_scales):
+        try:
+            yield MacroSubsystem(network, state, system,
+                                 time_scale=time_scale,
+                                 blackbox=blackbox,
+                                 coarse_grain=coarse_grain)
+        except (validate.StateUnreachableError,
+                ConditionallyDependentError):
+            continue
+
+
+# Wrapper for `big_phi` of a macro-system for parallel processing. `item` is
+# the position of the candidate macro-system and its arguments. The size and
+# Phi are `None` if the candidate is not a valid macro-system.
+def _macro_phi(network, state, item):
+    index, candidate = item
+    system, time_scale, blackbox, coarse_grain = candidate
+    try:
+        subsystem = MacroSubsystem(network, state, system,
+                                   time_scale=time_scale,
+                                   blackbox=blackbox,
+                                   coarse_grain=coarse_grain)
+    except (validate.StateUnreachableError, ConditionallyDependentError):
+        return index, candidate, None, None
+    return index, candidate, len(subsystem), compute.big_phi(subsystem)
+
+
+def _macro_phis(network, state, candidates):
+    """Yield the position, arguments, size and |big_phi| of each candidate
+    macro-system.
+
+    If ``config.PARALLEL_MACRO_EVALUATION`` is enabled, the candidates are
+    distributed across the worker pool and yielded in the order they are
+    finished.
+    """
+    items = enumerate(candidates)
+    if config.PARALLEL_MACRO_EVALUATION and not parallel.in_worker():
+        return parallel.get_pool().imap_unordered(_macro_phi, items,
+                                                  network, state)
+    return (_macro_phi(network, state, item) for item in items)
+
+
+def _max_macro_phi(network, state, candidates):
+    """Return the greatest |big_phi| of the candidate macro-systems and the
+    arguments of the first candidate with that |big_phi|.
+
+    Ties are broken by the position of the candidates, so the result is the
+    same whether or not they are evaluated in parallel.
+    """
+    max_phi = float('-inf')
+    max_index = None
+    max_candidate = None
+
+    for index, candidate, size, phi in _macro_phis(network, state,
+                                                   candidates):
+        if phi is None:
+            continue
+        if ((phi - max_phi) > constants.EPSILON or
+                (abs(phi - max_phi) <= constants.EPSILON and
+                 index < max_index)):
+            max_phi = phi
+            max_index = index
+            max_candidate = candidate
+
+    return max_phi, max_candidate
 
 
 def emergence(network, state, blackbox=False, coarse_grain=True,
@@ -776,46 +886,46 @@ def emergence(network, state, blackbox=False, coarse_grain=True,
     """
     micro_phi = compute.main_complex(network, state).phi
 
-    max_phi = float('-inf')
-    max_network = None
-
-    for subsystem in all_macro_systems(network, state, blackbox=blackbox,
-                                       coarse_grain=coarse_grain,
-                                       time_scales=time_scales):
-        phi = compute.big_phi(subsystem)
+    candidates = _macro_system_candidates(network, blackbox, coarse_grain,
+                                          time_scales)
+    max_phi, max_candidate = _max_macro_phi(network, state, candidates)
+    if max_candidate is None:
+        return None
 
-        if (phi - max_phi) > constants.EPSILON:
-            max_phi = phi
-            max_network = MacroNetwork(
-                network=network,
-                macro_phi=phi,
-                micro_phi=micro_phi,
-                system=subsystem._node_indices,
-                time_scale=subsystem._time_scale,
-                blackbox=subsystem._blackbox,
-                coarse_grain=subsystem._coarse_grain)
-
-    return max_network
+    system, time_scale, blackbox, coarse_grain = max_candidate
+    return MacroNetwork(
+        network=network,
+        macro_phi=max_phi,
+        micro_phi=micro_phi,
+        system=system,
+        time_scale=time_scale,
+        blackbox=blackbox,
+        coarse_grain=coarse_grain)
 
 
 def phi_by_grain(network, state):
-    list_of_phi = []
+    systems = list(utils.powerset(network.node_indices))
 
-    systems = utils.powerset(network.node_indices)
+    list_of_phi = []
     for system in systems:
         micro_subsystem = Subsystem(network, state, system)
         phi = compute.big_phi(micro_subsystem)
         list_of_phi.append([len(micro_subsystem), phi, system, None])
 
-        for coarse_grain in all_coarse_grains(system):
-            try:
-                subsystem = MacroSubsystem(network, state, system,
-                                           coarse_grain=coarse_grain)
-            except ConditionallyDependentError:
-                continue
+    # Evaluate the macro-systems of all systems at once, then put each one
+    # after its micro-system.
+    candidates = ((system, 1, None, coarse_grain) for system in systems
+                  for coarse_grain in all_coarse_grains(system))
+    macro_phis = sorted(_macro_phis(network, state, candidates),
+                        key=lambda result: result[0])
+    for index, candidate, size, phi in macro_phis:
+        if phi is None:
+            continue
+        system, time_scale, blackbox, coarse_grain = candidate
+        list_of_phi.append([size, phi, system, coarse_grain])
 
-            phi = compute.big_phi(subsystem)
-            list_of_phi.append([len(subsystem), phi, system, coarse_grain])
+    position = {system: i for i, system in enumerate(systems)}
+    list_of_phi.sort(key=lambda row: position[row[2]])
     return list_of_phi
 
 
@@ -8,8 +8,6 @@ Decorators and objects for memoization.
 
 import functools
 
-import joblib.func_inspect
-
 from . import config, constants, db
 
 
@@ -20,7 +18,19 @@ def cache(ignore=[]):
     def joblib_decorator(func):
         if func.__name__ == '_big_mip' and not config.CACHE_BIGMIPS:
             return func
-        return constants.joblib_memory.cache(func, ignore=ignore)
+        memoized_func = None
+
+        # The joblib memoizer is only created when the function is first
+        # called, so that decorating it does not import joblib.
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal memoized_func
+            if memoized_func is None:
+                memoized_func = constants.joblib_memory.cache(func,
+                                                              ignore=ignore)
+            return memoized_func(*args, **kwargs)
+
+        return wrapper
 
     def db_decorator(func):
         if func.__name__ == '_big_mip' and not config.CACHE_BIGMIPS:
@@ -70,6 +80,8 @@ class DbMemoizedFunc:
     def get_output_key(self, args, kwargs):
         """Return the key that the output should be cached with, given
         arguments, keyword arguments, and a list of arguments to ignore."""
+        import joblib.func_inspect
+
         # Get a dictionary mapping argument names to argument values where
         # ignored arguments are omitted.
         filtered_args = joblib.func_inspect.filter_args(
@@ -3,7 +3,8 @@
 # -*- coding: utf-8 -*-
 # models/__init__.py
 
-"""See |models.big_phi|, |models.concept|, and |models.cuts| for documentation.
+"""See |models.big_phi|, |models.concept|, |models.cuts|, and
+|models.repertoire| for documentation.
 
 Attributes:
     BigMip: Alias for :class:`big_phi.BigMip`
@@ -14,9 +15,11 @@ Attributes:
     Cut: Alias for :class:`cuts.Cut`
     Part: Alias for :class:`cuts.Part`
     Bipartition: Alias for :class:`cuts.Bipartition`
+    FactoredRepertoire: Alias for :class:`repertoire.FactoredRepertoire`
 """
 
 from .big_phi import BigMip, _null_bigmip, _single_node_bigmip
 from .concept import (Mip, _null_mip, Mice, Concept, Constellation,
                       normalize_constellation)
 from .cuts import Cut, Part, Bipartition
+from .repertoire import FactoredRepertoire
@@ -33,6 +33,9 @@ class BigMip(cmp._Orderable):
         time (float): The number of seconds it took to calculate.
         small_phi_time (float): The number of seconds it took to calculate the
             unpartitioned constellation.
+        cuts_evaluated (int): The number of cuts that were evaluated.
+        upper_bound (bool): Whether the computation ran out of budget before
+            every cut was evaluated, so that ``phi`` is only an upper bound.
     """
 
     def __init__(self, phi=None, unpartitioned_constellation=None,
@@ -45,6 +48,8 @@ class BigMip(cmp._Orderable):
         self.cut_subsystem = cut_subsystem
         self.time = None
         self.small_phi_time = None
+        self.cuts_evaluated = None
+        self.upper_bound = False
 
     def __repr__(self):
         return fmt.make_repr(self, _bigmip_attributes)
@@ -89,7 +94,8 @@ class BigMip(cmp._Orderable):
     def to_json(self):
         return {
             attr: jsonify.jsonify(getattr(self, attr))
-            for attr in _bigmip_attributes + ['time', 'small_phi_time']
+            for attr in _bigmip_attributes + ['time', 'small_phi_time',
+                                              'cuts_evaluated', 'upper_bound']
         }
 
 
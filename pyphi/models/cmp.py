@@ -12,6 +12,7 @@ from collections import Iterable
 import numpy as np
 
 from .. import utils
+from .repertoire import FactoredRepertoire
 
 
 # Rich comparison (ordering) helpers
@@ -96,7 +97,8 @@ def _numpy_aware_eq(a, b):
     """Return whether two objects are equal via recursion, using
     :func:`numpy.array_equal` for comparing numpy arays.
     """
-    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+    if (isinstance(a, (np.ndarray, FactoredRepertoire)) or
+            isinstance(b, (np.ndarray, FactoredRepertoire))):
         return np.array_equal(a, b)
     if ((isinstance(a, Iterable) and isinstance(b, Iterable))
             and not isinstance(a, str) and not isinstance(b, str)):
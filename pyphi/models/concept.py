@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 # models/concept.py
 
+import sys
+
 import numpy as np
 
 from . import cmp, fmt
@@ -116,6 +118,12 @@ class Mip(cmp._Orderable):
                      self.purview,
                      utils.np_hash(self.unpartitioned_repertoire)))
 
+    def __sizeof__(self):
+        # Include the repertoires, which make up most of the size of a MIP.
+        return (super().__sizeof__() +
+                sys.getsizeof(self._unpartitioned_repertoire) +
+                sys.getsizeof(self._partitioned_repertoire))
+
     def __repr__(self):
         return fmt.make_repr(self, _mip_attributes)
 
@@ -206,6 +214,9 @@ class Mice(cmp._Orderable):
     def __hash__(self):
         return hash(('Mice', self._mip))
 
+    def __sizeof__(self):
+        return super().__sizeof__() + sys.getsizeof(self._mip)
+
     def to_json(self):
         return {
             'phi': self.phi,
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# models/repertoire.py
+
+import sys
+
+import numpy as np
+from numpy.lib.mixins import NDArrayOperatorsMixin
+
+
+class FactoredRepertoire(NDArrayOperatorsMixin):
+    """A repertoire that is the product of independent per-node marginals.
+
+    Effect repertoires are, by construction, products of the marginal
+    distributions of the purview nodes. Rather than storing the full |2^N|
+    distribution, this stores only the marginals; the dense array is built
+    lazily when it is needed (*e.g.* by ``np.asarray``).
+
+    The dense form has the same shape as an ordinary repertoire: there is one
+    dimension per node in the system, of size 2 if the node is in the purview
+    and 1 otherwise. Arithmetic and NumPy functions operate on the dense form,
+    except that multiplication by another factored repertoire over a disjoint
+    purview stays factored.
+
+    Attributes:
+        purview (tuple[int]): The nodes over which the repertoire is a
+            distribution, in ascending order.
+        marginals (np.ndarray): A ``|purview| x 2`` array where
+            ``marginals[i]`` is the distribution ``(P(off), P(on))`` of the
+            node ``purview[i]``.
+        size (int): The number of dimensions of the dense repertoire.
+    """
+
+    def __init__(self, purview, marginals, size):
+        self.purview = tuple(purview)
+        self.marginals = np.asarray(marginals, dtype=float).reshape(-1, 2)
+        self.size = size
+
+        if len(self.purview) != len(self.marginals):
+            raise ValueError('There must be one marginal per purview node.')
+
+    @property
+    def shape(self):
+        """tuple[int]: The shape of the dense repertoire."""
+        return tuple(2 if i in self.purview else 1 for i in range(self.size))
+
+    @property
+    def ndim(self):
+        """int: The number of dimensions of the dense repertoire."""
+        return self.size
+
+    def dense(self):
+        """Return the repertoire as a full ``np.ndarray``."""
+        repertoire = np.ones(self.shape)
+        for index, marginal in zip(self.purview, self.marginals):
+            shape = [1] * self.size
+            shape[index] = 2
+            repertoire = repertoire * marginal.reshape(shape)
+        return repertoire
+
+    def __array__(self, dtype=None):
+        repertoire = self.dense()
+        if dtype is not None:
+            repertoire = repertoire.astype(dtype)
+        return repertoire
+
+    def flatten(self, order='C'):
+        """Return the dense repertoire collapsed into one dimension."""
+        return self.dense().flatten(order=order)
+
+    def squeeze(self):
+        """Return the dense repertoire with singleton dimensions removed."""
+        return self.dense().squeeze()
+
+    def marginal_zeros(self):
+        """Return the probability that each purview node is off.
+
+        Returns:
+            np.ndarray: The marginal probabilities, in purview order.
+        """
+        sums = self.marginals.sum(1)
+        # The total mass of the repertoire, excluding each node in turn.
+        rest = np.array([np.prod(np.delete(sums, i))
+                         for i in range(len(sums))])
+        return self.marginals[:, 0] * rest
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if (ufunc is np.multiply and method == '__call__' and not kwargs and
+                len(inputs) == 2):
+            product = self._factored_product(*inputs)
+            if product is not None:
+                return product
+
+        inputs = tuple(np.asarray(x) if isinstance(x, FactoredRepertoire)
+                       else x for x in inputs)
+        return getattr(ufunc, method)(*inputs, **kwargs)
+
+    @staticmethod
+    def _factored_product(a, b):
+        """Return the product of ``a`` and ``b`` as a factored repertoire, or
+        ``None`` if it must be computed densely.
+
+        The product of two factored repertoires over disjoint purviews is
+        itself factored. Multiplying by the multiplicative identity (the
+        repertoire over an empty purview) leaves a repertoire unchanged.
+        """
+        if not isinstance(a, FactoredRepertoire):
+            a, b = b, a
+
+        if isinstance(b, FactoredRepertoire):
+            if a.size != b.size or set(a.purview) & set(b.purview):
+                return None
+            factors = sorted(list(zip(a.purview, a.marginals)) +
+                             list(zip(b.purview, b.marginals)),
+                             key=lambda factor: factor[0])
+            return FactoredRepertoire(
+                [index for index, marginal in factors],
+                [marginal for index, marginal in factors],
+                a.size)
+
+        if np.size(b) == 1 and np.all(np.asarray(b) == 1):
+            return a
+
+        return None
+
+    def __sizeof__(self):
+        return super().__sizeof__() + sys.getsizeof(self.marginals)
+
+    def __repr__(self):
+        return 'FactoredRepertoire(purview={}, marginals={}, size={})'.format(
+            self.purview, self.marginals.tolist(), self.size)
+
+    def __str__(self):
+        return str(self.dense())
+
+    def to_json(self):
+        return self.dense()
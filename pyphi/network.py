@@ -163,6 +163,16 @@ class Network:
         self._perturb_vector.flags.writeable = False
         # Update hash.
         self._pv_hash = utils.np_hash(self.perturb_vector)
+        self._digest = None
+
+    @property
+    def digest(self):
+        """str: A stable digest of the network's TPM, connectivity matrix
+        and perturbation vector. See :func:`pyphi.utils.digest`."""
+        if self._digest is None:
+            self._digest = utils.digest(
+                ('Network', self.tpm, self.cm, self.perturb_vector))
+        return self._digest
 
     def labels2indices(self, labels):
         """Convert a tuple of node labels to node indices."""
@@ -228,8 +238,7 @@ class Network:
         return not self.__eq__(other)
 
     def __hash__(self):
-        # TODO: hash only once?
-        return hash((self._tpm_hash, self._cm_hash, self._pv_hash))
+        return int(self.digest, 16)
 
     def to_json(self):
         return {
@@ -12,7 +12,8 @@ from . import cache, config, utils, validate
 from .config import PRECISION
 from .constants import DIRECTIONS, FUTURE, PAST
 from .jsonify import jsonify
-from .models import Concept, Cut, Mice, Mip, _null_mip, Part, Bipartition
+from .models import (Concept, Cut, Mice, Mip, _null_mip, Part, Bipartition,
+                     FactoredRepertoire)
 from .network import irreducible_purviews
 from .node import generate_nodes
 
@@ -44,6 +45,8 @@ class Subsystem:
         null_cut (Cut): The cut object representing no cut.
         perturb_vector (np.array): The vector of perturbation probabilities for
             each node.
+        digest (str): A stable digest of the network, state, nodes and cut of
+            the subsystem. See :func:`pyphi.utils.digest`.
     """
 
     def __init__(self, network, state, nodes, cut=None,
@@ -87,9 +90,9 @@ class Subsystem:
         # The perturbation probabilities for each node in the network
         self.perturb_vector = network.perturb_vector
 
-        # Only compute hash once.
-        self._hash = hash((self.network, self.node_indices, self.state,
-                           self.cut))
+        # Only compute the digest and hash once.
+        self.digest = utils.digest(self._digest_content())
+        self._hash = int(self.digest, 16)
 
         # Reusable cache for core causes & effects
         self._mice_cache = cache.MiceCache(self, mice_cache)
@@ -223,6 +226,11 @@ class Subsystem:
         """Return the hash value of this Subsystem."""
         return self._hash
 
+    def _digest_content(self):
+        """Return the objects which identify this subsystem in its digest."""
+        return ('Subsystem', self.network, self.node_indices, self.state,
+                self.cut)
+
     def to_json(self):
         """Return this Subsystem as a JSON object."""
         return {
@@ -288,6 +296,49 @@ class Subsystem:
             purview-repertoires with each other, since cut vs. whole
             comparisons are only ever done over the same purview.
         """
+        return self._cause_repertoire(mechanism, purview, {})
+
+    def cause_repertoires(self, mechanism, purviews):
+        """Return the cause repertoires of a mechanism over many purviews.
+
+        This computes the repertoires in a single pass: each mechanism node's
+        conditioned TPM is marginalized over a given set of non-purview inputs
+        only once, and the result is shared by every purview that leaves the
+        same inputs out. The repertoires are stored in the repertoire cache,
+        so later calls to |cause_repertoire| with these arguments are hits.
+
+        Args:
+            mechanism (tuple[int]): The mechanism for which to calculate the
+                cause repertoires.
+            purviews (Iterable[tuple[int]]): The purviews over which to
+                calculate the cause repertoires.
+
+        Returns:
+            tuple[np.ndarray]: The cause repertoire over each purview, in the
+            order the purviews were given.
+        """
+        # Marginalized node TPMs shared between purviews
+        marginals = {}
+        repertoires = []
+
+        for purview in purviews:
+            key = self._repertoire_cache.key(mechanism, purview,
+                                             _prefix=DIRECTIONS[PAST])
+            repertoire = self._repertoire_cache.get(key)
+            if repertoire is None:
+                repertoire = self._cause_repertoire(mechanism, purview,
+                                                    marginals)
+                self._repertoire_cache.set(key, repertoire)
+            repertoires.append(repertoire)
+
+        return tuple(repertoires)
+
+    def _cause_repertoire(self, mechanism, purview, marginals):
+        """Compute a cause repertoire.
+
+        ``marginals`` is a dictionary of marginalized mechanism node TPMs which
+        is read from and updated in place. See |cause_repertoire|.
+        """
         # If the purview is empty, the distribution is empty; return the
         # multiplicative identity.
         if not purview:
@@ -311,18 +362,12 @@ class Subsystem:
         # get the conditional joint distribution for the whole mechanism
         # (conditioned on the whole mechanism's state).
         for mechanism_node in self.indices2nodes(mechanism):
-            # TODO extend to nonbinary nodes
-            # We're conditioning on this node's state, so take the probability
-            # table for the node being in that state.
-            conditioned_tpm = mechanism_node.tpm[mechanism_node.state]
-
             # Marginalize-out all nodes which connect to this node but which
             # are not in the purview:
-            non_purview_inputs = (set(mechanism_node.input_indices) -
-                                  set(purview))
-            for index in non_purview_inputs:
-                conditioned_tpm = utils.marginalize_out(
-                    index, conditioned_tpm, self.perturb_vector[index])
+            non_purview_inputs = tuple(sorted(
+                set(mechanism_node.input_indices) - set(purview)))
+            conditioned_tpm = self._marginalized_mechanism_tpm(
+                mechanism_node, non_purview_inputs, marginals)
 
             # Incorporate this node's CPT into the mechanism's conditional
             # joint distribution by taking the product (with singleton
@@ -338,6 +383,31 @@ class Subsystem:
 
         return utils.normalize(cjd)
 
+    def _marginalized_mechanism_tpm(self, node, indices, marginals):
+        """Return the TPM of a mechanism node, conditioned on the node's state,
+        with the nodes in ``indices`` marginalized out.
+
+        Results are memoized in ``marginals``. Marginalizing out ``indices``
+        reuses the TPM with ``indices[:-1]`` marginalized out, so each distinct
+        set of indices costs a single marginalization.
+        """
+        key = (node.index, indices)
+        if key not in marginals:
+            if not indices:
+                # TODO extend to nonbinary nodes
+                # We're conditioning on this node's state, so take the
+                # probability table for the node being in that state.
+                tpm = node.tpm[node.state]
+            else:
+                index = indices[-1]
+                tpm = utils.marginalize_out(
+                    index,
+                    self._marginalized_mechanism_tpm(node, indices[:-1],
+                                                     marginals),
+                    self.perturb_vector[index])
+            marginals[key] = tpm
+        return marginals[key]
+
     @cache.method('_repertoire_cache', DIRECTIONS[FUTURE])
     def effect_repertoire(self, mechanism, purview):
         """Return the effect repertoire of a mechanism over a purview.
@@ -349,8 +419,11 @@ class Subsystem:
                 effect repertoire.
 
         Returns:
-            ``np.ndarray``: The effect repertoire of the mechanism over the
-                purview.
+            FactoredRepertoire: The effect repertoire of the mechanism over the
+                purview, stored as the product of the marginal distributions of
+                the purview nodes. Use ``np.asarray`` to obtain the dense
+                distribution. If the purview is empty, the multiplicative
+                identity ``np.array([1.0])`` is returned instead.
 
         .. note::
             The returned repertoire is a distribution over the nodes in the
@@ -361,48 +434,25 @@ class Subsystem:
             comparisons are only ever done over the same purview.
         """
         purview_nodes = self.indices2nodes(purview)
-        mechanism_nodes = self.indices2nodes(mechanism)
 
         # If the purview is empty, the distribution is empty, so return the
         # multiplicative identity.
         if not purview:
             return np.array([1.0])
 
-        # Preallocate the purview's joint distribution
-        # TODO extend to nonbinary nodes
-        accumulated_cjd = np.ones(
-            [1] * len(self.tpm_indices) +
-            [2 if i in purview else 1 for i in self.tpm_indices])
-
-        # Loop over all nodes in the purview, successively taking the product
-        # (with 'expansion'/'broadcasting' of singleton dimensions) of each
-        # individual node's TPM in order to get the joint distribution for the
-        # whole purview.
+        # Because the purview nodes are conditionally independent given the
+        # mechanism, the effect repertoire is the product of the distributions
+        # of the individual purview nodes. We compute only these marginals and
+        # leave the (exponentially large) product to be formed lazily.
+        marginals = []
         for purview_node in purview_nodes:
-            # Unlike in calculating the cause repertoire, here the TPM is not
-            # conditioned yet. `tpm` is an array with twice as many dimensions
-            # as the network has nodes. For example, in a network with three
-            # nodes {n0, n1, n2}, the CPT for node n1 would have shape
-            # (2,2,2,1,2,1). The CPT for the node being off would be given by
-            # `tpm[:,:,:,0,0,0]`, and the CPT for the node being on would be
-            # given by `tpm[:,:,:,0,1,0]`. The second half of the shape is for
-            # indexing based on the current node's state, and the first half of
-            # the shape is the CPT indexed by network state, so that the
-            # overall CPT can be broadcast over the `accumulated_cjd` and then
-            # later conditioned by indexing.
-            # TODO extend to nonbinary nodes
-
             # Rotate the dimensions so the first dimension is the last (the
-            # first dimension corresponds to the state of the node)
+            # first dimension corresponds to the state of the node), leaving
+            # the CPT indexed by network state.
+            # TODO extend to nonbinary nodes
             tpm = purview_node.tpm
             tpm = tpm.transpose(list(range(tpm.ndim))[1:] + [0])
 
-            # Expand the dimensions so the TPM can be indexed as described
-            first_half_shape = list(tpm.shape[:-1])
-            second_half_shape = [1] * len(self.tpm_indices)
-            second_half_shape[purview_node.index] = 2
-            tpm = tpm.reshape(first_half_shape + second_half_shape)
-
             # Marginalize-out non-mechanism purview inputs.
             non_mechanism_inputs = (set(purview_node.input_indices) -
                                     set(mechanism))
@@ -410,26 +460,16 @@ class Subsystem:
                 tpm = utils.marginalize_out(index, tpm,
                                             self.perturb_vector[index])
 
-            # Incorporate this node's CPT into the future_nodes' conditional
-            # joint distribution (with singleton broadcasting).
-            accumulated_cjd = accumulated_cjd * tpm
+            # Condition on the state of the mechanism nodes which input to
+            # this node. All other dimensions are now singletons, so what
+            # remains is the distribution over this node's state.
+            mechanism_inputs = (set(purview_node.input_indices) &
+                                set(mechanism))
+            tpm = utils.condition_tpm(tpm, mechanism_inputs, self.state)
 
-        # Collect all mechanism nodes which input to purview nodes; condition
-        # on the state of these nodes by collapsing the CJD onto those states.
-        mechanism_inputs = [node.index for node in mechanism_nodes
-                            if set(node.output_indices) & set(purview)]
-        accumulated_cjd = utils.condition_tpm(
-            accumulated_cjd, mechanism_inputs, self.state)
+            marginals.append(tpm.reshape(2))
 
-        # The distribution still has twice as many dimensions as the network
-        # has nodes, with the first half of the shape now all singleton
-        # dimensions, so we reshape to eliminate those singleton dimensions
-        # (the second half of the shape may also contain singleton dimensions,
-        # depending on how many nodes are in the purview).
-        accumulated_cjd = accumulated_cjd.reshape(
-            accumulated_cjd.shape[len(self.tpm_indices):])
-
-        return accumulated_cjd
+        return FactoredRepertoire(purview, marginals, len(self.tpm_indices))
 
     def _repertoire(self, direction, mechanism, purview):
         """Return the cause or effect repertoire based on a direction.
@@ -511,7 +551,7 @@ class Subsystem:
         uc = self._unconstrained_repertoire(direction, non_purview_indices)
         # Multiply the given repertoire by the unconstrained one to get a
         # distribution over all the nodes in the network.
-        expanded_repertoire = repertoire * uc
+        expanded_repertoire = np.asarray(repertoire * uc)
 
         return utils.normalize(expanded_repertoire)
 
@@ -594,27 +634,49 @@ class Subsystem:
                 np.all(unpartitioned_repertoire == 0)):
             return _mip(0, None, None)
 
-        # Loop over possible MIP bipartitions
-        for partition in mip_bipartitions(mechanism, purview):
-            partitioned_repertoire = self.partitioned_repertoire(direction,
-                                                                 partition)
+        partitions = mip_bipartitions(mechanism, purview)
 
-            if config.L1_DISTANCE_APPROXIMATION:
-                phi = utils.l1(unpartitioned_repertoire,
-                               partitioned_repertoire)
-                phi = round(phi, PRECISION)
-            else:
-                phi = emd(direction, unpartitioned_repertoire,
-                          partitioned_repertoire)
+        if (partitions and config.VECTORIZED_MIP_EVALUATION and
+                (config.L1_DISTANCE_APPROXIMATION or
+                 direction == DIRECTIONS[FUTURE])):
+            partitioned_repertoires = [
+                self.partitioned_repertoire(direction, partition)
+                for partition in partitions]
+            phis = _batch_mip_phis(unpartitioned_repertoire,
+                                   partitioned_repertoires)
 
-            # Return immediately if mechanism is reducible.
-            if phi == 0:
-                return _mip(0.0, partition, partitioned_repertoire)
+            # As when evaluating the partitions in turn, the MIP is the first
+            # partition for which the mechanism is reducible or, failing that,
+            # the first with minimal phi.
+            if 0 in phis:
+                i = phis.index(0)
+                return _mip(0.0, partitions[i], partitioned_repertoires[i])
 
-            # Update MIP if it's more minimal.
-            if phi < phi_min:
-                phi_min = phi
-                mip = _mip(phi, partition, partitioned_repertoire)
+            i = phis.index(min(phis))
+            mip = _mip(phis[i], partitions[i], partitioned_repertoires[i])
+
+        else:
+            # Loop over possible MIP bipartitions
+            for partition in partitions:
+                partitioned_repertoire = self.partitioned_repertoire(
+                    direction, partition)
+
+                if config.L1_DISTANCE_APPROXIMATION:
+                    phi = utils.l1(unpartitioned_repertoire,
+                                   partitioned_repertoire)
+                    phi = round(phi, PRECISION)
+                else:
+                    phi = emd(direction, unpartitioned_repertoire,
+                              partitioned_repertoire)
+
+                # Return immediately if mechanism is reducible.
+                if phi == 0:
+                    return _mip(0.0, partition, partitioned_repertoire)
+
+                # Update MIP if it's more minimal.
+                if phi < phi_min:
+                    phi_min = phi
+                    mip = _mip(phi, partition, partitioned_repertoire)
 
         # Recompute distance for minimal MIP using the EMD
         if config.L1_DISTANCE_APPROXIMATION:
@@ -720,6 +782,11 @@ class Subsystem:
         if not purviews:
             max_mip = _null_mip(direction, mechanism, ())
         else:
+            if direction == DIRECTIONS[PAST]:
+                # Compute the cause repertoires over every candidate purview
+                # in one batch, sharing marginalized node TPMs; `find_mip`
+                # then retrieves them from the repertoire cache.
+                self.cause_repertoires(mechanism, purviews)
             max_mip = max(self.find_mip(direction, mechanism, purview)
                           for purview in purviews)
 
@@ -854,11 +921,61 @@ def effect_emd(d1, d2):
 
     Returns:
         float: The EMD between ``d1`` and ``d2``.
+
+    .. note::
+        If both repertoires are |FactoredRepertoire| objects over the same
+        purview, the marginals are read directly from their factors and the
+        dense distributions are never formed.
     """
+    if (isinstance(d1, FactoredRepertoire) and
+            isinstance(d2, FactoredRepertoire) and d1.purview == d2.purview):
+        return np.abs(d1.marginal_zeros() - d2.marginal_zeros()).sum()
+
+    d1, d2 = np.asarray(d1), np.asarray(d2)
     return sum(np.abs(utils.marginal_zero(d1, i) - utils.marginal_zero(d2, i))
                for i in range(d1.ndim))
 
 
+def _batch_mip_phis(unpartitioned_repertoire, partitioned_repertoires):
+    """Compute the distances between a repertoire and many partitioned
+    repertoires at once, for |find_mip|.
+
+    The L1 distance is used if ``config.L1_DISTANCE_APPROXIMATION`` is
+    enabled; otherwise the repertoires must be effect repertoires, and the
+    effect EMD is used. If the repertoires are |FactoredRepertoire| objects
+    over the same purview, the effect EMD is computed from their marginals,
+    as in :func:`effect_emd`, without forming the dense distributions.
+
+    Returns:
+        list[float]: The distances, rounded to |PRECISION| as when they are
+        computed one at a time.
+    """
+    if config.L1_DISTANCE_APPROXIMATION:
+        unpartitioned = np.asarray(unpartitioned_repertoire)
+        # Stack the partitioned repertoires along a new first axis,
+        # broadcasting those over a single part of the partition to the full
+        # shape.
+        stack = np.stack([np.broadcast_to(np.asarray(r), unpartitioned.shape)
+                          for r in partitioned_repertoires])
+        distances = np.abs(stack - unpartitioned).reshape(
+            len(partitioned_repertoires), -1).sum(1).tolist()
+
+    elif (isinstance(unpartitioned_repertoire, FactoredRepertoire) and
+          all(isinstance(r, FactoredRepertoire) and
+              r.purview == unpartitioned_repertoire.purview
+              for r in partitioned_repertoires)):
+        zeros = np.array([r.marginal_zeros() for r in partitioned_repertoires])
+        distances = np.abs(
+            zeros - unpartitioned_repertoire.marginal_zeros()).sum(1).tolist()
+
+    else:
+        distances = [effect_emd(unpartitioned_repertoire, r)
+                     for r in partitioned_repertoires]
+
+    # `emd` rounds effect EMDs in the same way.
+    return [round(distance, PRECISION) for distance in distances]
+
+
 # Hack hack quick and dirty stats
 independent_repertoires = 0
 total_repertoires = 0
@@ -16,12 +16,8 @@ import numpy as np
 from itertools import chain, combinations
 
 from pyemd import emd
-from scipy.misc import comb
-from scipy.spatial.distance import cdist
-from scipy.sparse import csc_matrix
-from scipy.sparse.csgraph import connected_components
 
-from . import constants, convert
+from . import config, constants, convert
 from .cache import cache
 
 
@@ -58,6 +54,8 @@ def sparse(matrix, threshold=0.1):
 
 
 def sparse_time(tpm, time_scale):
+    from scipy.sparse import csc_matrix
+
     sparse_tpm = csc_matrix(tpm)
     return (sparse_tpm ** time_scale).toarray()
 
@@ -108,6 +106,32 @@ def state_by_state(tpm):
     return tpm.ndim == 2 and tpm.shape[0] == tpm.shape[1]
 
 
+def simulate(tpm, state, steps, seed=None):
+    """Simulate a time series of states of a network.
+
+    At each step, every node turns on independently with the probability
+    given by the multidimensional state-by-node TPM.
+
+    Args:
+        tpm (np.ndarray): The multidimensional state-by-node TPM.
+        state (tuple[int]): The initial state.
+        steps (int): The number of steps to simulate.
+
+    Keyword Args:
+        seed (int): The seed of the random number generator.
+
+    Returns:
+        list[tuple[int]]: The initial state followed by the state after each
+        step.
+    """
+    random = np.random.RandomState(seed)
+    states = [tuple(state)]
+    for _ in range(steps):
+        p = tpm[states[-1]]
+        states.append(tuple(int(x) for x in random.random_sample(len(p)) < p))
+    return states
+
+
 def condition_tpm(tpm, fixed_nodes, state):
     """Return a TPM conditioned on the given fixed node indices, whose states
     are fixed according to the given state-tuple.
@@ -222,6 +246,88 @@ def np_hash(a):
     return int(hashlib.sha1(a.view(a.dtype)).hexdigest(), 16)
 
 
+# The version of the encoding used by `digest`. Incrementing it invalidates
+# every key of the persistent caches.
+DIGEST_VERSION = 1
+
+
+def digest(obj):
+    """Return a stable, content-addressed digest of an object.
+
+    Unlike ``hash``, the digest is the same in every process and on every
+    machine, so it can be used as the key of a persistent cache.
+
+    Supported objects are ``None``, booleans, numbers, strings, bytes, NumPy
+    arrays, and tuples, lists, namedtuples and dicts of supported objects.
+    Objects with a ``digest`` attribute, such as |Network| and |Subsystem|,
+    are represented by it.
+
+    Returns:
+        str: The hexadecimal SHA-1 digest.
+
+    Raises:
+        TypeError: If the object, or an object it contains, is not supported.
+
+    Example:
+        >>> digest((0, 1)) == digest((0, 1))
+        True
+        >>> digest((0, 1)) == digest([0, 1])
+        False
+    """
+    h = hashlib.sha1('pyphi-{}'.format(DIGEST_VERSION).encode())
+    _update_digest(h, obj)
+    return h.hexdigest()
+
+
+def _update_digest(h, obj):
+    """Add the encoding of an object to a running digest.
+
+    Every encoding starts with a tag for the type of the object, and variable
+    length encodings record their length, so distinct objects never have the
+    same encoding.
+    """
+    own_digest = getattr(obj, 'digest', None)
+    if isinstance(own_digest, str):
+        h.update('D{}:{}'.format(type(obj).__name__, own_digest).encode())
+    elif obj is None:
+        h.update(b'N')
+    elif isinstance(obj, (bool, np.bool_)):
+        h.update(b'B1' if obj else b'B0')
+    elif isinstance(obj, (int, np.integer)):
+        h.update('I{};'.format(int(obj)).encode())
+    elif isinstance(obj, (float, np.floating)):
+        h.update('F{};'.format(float(obj).hex()).encode())
+    elif isinstance(obj, str):
+        data = obj.encode()
+        h.update('S{}:'.format(len(data)).encode() + data)
+    elif isinstance(obj, bytes):
+        h.update('Y{}:'.format(len(obj)).encode() + obj)
+    elif isinstance(obj, np.ndarray):
+        # Use little-endian, C-ordered data whatever the memory layout.
+        obj = np.ascontiguousarray(obj, dtype=obj.dtype.newbyteorder('<'))
+        h.update('A{}{};'.format(obj.dtype.str, obj.shape).encode())
+        h.update(obj.view(np.uint8))
+    elif isinstance(obj, (tuple, list)):
+        if isinstance(obj, list):
+            tag = 'L'
+        elif hasattr(obj, '_fields'):
+            # Namedtuples are distinguished by their type.
+            tag = 'T' + type(obj).__name__
+        else:
+            tag = 'T'
+        h.update('{}{}:'.format(tag, len(obj)).encode())
+        for item in obj:
+            _update_digest(h, item)
+    elif isinstance(obj, dict):
+        h.update('M{}:'.format(len(obj)).encode())
+        for key, value in sorted(obj.items(), key=lambda i: digest(i[0])):
+            _update_digest(h, key)
+            _update_digest(h, value)
+    else:
+        raise TypeError('Cannot digest object of type {}'.format(
+            type(obj).__name__))
+
+
 def phi_eq(x, y):
     """Compare two phi values up to |PRECISION|."""
     return abs(x - y) <= constants.EPSILON
@@ -289,6 +395,8 @@ def comb_indices(n, k):
                 [3, 5],
                 [4, 5]]])
     """
+    from scipy.misc import comb
+
     # Count the number of combinations for preallocation
     count = comb(n, k, exact=True)
     # Get numpy iterable from ``itertools.combinations``
@@ -454,8 +562,15 @@ def hamming_emd(d1, d2):
     by state, one dimension per node).
 
     Singleton dimensions are sqeezed out.
+
+    The solver is chosen by ``config.HAMMING_EMD_SOLVER``: either ``pyemd``,
+    which solves the dense transportation problem, or :func:`hypercube_emd`.
     """
-    d1, d2 = d1.squeeze(), d2.squeeze()
+    d1, d2 = np.asarray(d1).squeeze(), np.asarray(d2).squeeze()
+
+    if config.HAMMING_EMD_SOLVER == 'hypercube':
+        return hypercube_emd(d1, d2)
+
     N = d1.ndim
 
     # Compute EMD using the Hamming distance between states as the
@@ -463,6 +578,111 @@ def hamming_emd(d1, d2):
     return emd(d1.ravel(), d2.ravel(), _hamming_matrix(N))
 
 
+# Flows and masses smaller than this are treated as zero by `hypercube_emd`.
+_FLOW_EPSILON = 1e-14
+
+
+def hypercube_emd(d1, d2):
+    """Return the Earth Mover's Distance between two distributions, using the
+    Hamming distance between states as the ground distance.
+
+    Under the Hamming distance the cost of moving mass between two states is
+    the length of the shortest path between them along the edges of the
+    |N|-dimensional hypercube. The EMD is therefore the cost of a minimum-cost
+    flow over the |N * 2^(N - 1)| hypercube edges, each with unit cost, which
+    is found here with successive shortest paths. Unlike the dense solver, the
+    |2^N x 2^N| Hamming matrix is never constructed.
+
+    Args:
+        d1 (np.ndarray): The first distribution, one dimension per node.
+        d2 (np.ndarray): The second distribution, one dimension per node.
+
+    Returns:
+        float: The EMD between ``d1`` and ``d2``.
+
+    Raises:
+        ValueError: If the distributions do not have the same binary shape.
+
+    Example:
+        >>> d1 = np.array([[1.0, 0.0], [0.0, 0.0]])
+        >>> d2 = np.array([[0.0, 0.0], [0.0, 1.0]])
+        >>> hypercube_emd(d1, d2)
+        2.0
+    """
+    d1, d2 = np.asarray(d1).squeeze(), np.asarray(d2).squeeze()
+    if d1.shape != d2.shape or any(size != 2 for size in d1.shape):
+        raise ValueError('Distributions must have the same shape, with one '
+                         'binary dimension per node.')
+
+    N = d1.ndim
+    # States are ordered by the binary expansion of their index, with the last
+    # node as the least significant bit.
+    surplus = (d1 - d2).ravel().astype(float)
+    supply = np.maximum(surplus, 0)
+    demand = np.maximum(-surplus, 0)
+
+    states = np.arange(2 ** N)
+    bits = [1 << (N - 1 - k) for k in range(N)]
+    neighbors = [states ^ bit for bit in bits]
+    # `flow[k][i]` is the net flow from state `i` to its neighbor along
+    # dimension `k`, so that `flow[k][i] == -flow[k][neighbors[k][i]]`.
+    flow = np.zeros((N, 2 ** N))
+
+    while (supply > _FLOW_EPSILON).any() and (demand > _FLOW_EPSILON).any():
+        # The residual cost of moving mass from `i` along dimension `k` is -1
+        # if doing so cancels existing flow in the other direction, and 1
+        # otherwise.
+        cost = np.where(flow < -_FLOW_EPSILON, -1, 1)
+
+        # Find the shortest paths from all states with remaining supply
+        # (Bellman-Ford, relaxing every edge along a dimension at once).
+        # Costs are integers, so distances are compared exactly.
+        unreachable = 2 ** N * N
+        distance = np.where(supply > _FLOW_EPSILON, 0, unreachable)
+        predecessor = np.full(2 ** N, -1)
+        changed = True
+        while changed:
+            changed = False
+            for k in range(N):
+                candidate = distance[neighbors[k]] + cost[k][neighbors[k]]
+                improved = ((candidate < distance) &
+                            (distance[neighbors[k]] < unreachable))
+                if improved.any():
+                    distance = np.where(improved, candidate, distance)
+                    predecessor[improved] = k
+                    changed = True
+
+        # Augment along the tree of shortest paths to each of the nearest
+        # states with remaining demand. Every tree edge has zero reduced cost,
+        # so these augmentations preserve the optimality of the flow.
+        sinks = np.flatnonzero(demand > _FLOW_EPSILON)
+        nearest = distance[sinks].min()
+        for sink in sinks[distance[sinks] == nearest]:
+            path = []
+            state = sink
+            while predecessor[state] != -1:
+                k = predecessor[state]
+                state = neighbors[k][state]
+                path.append((k, state))
+            source = state
+
+            amount = min(supply[source], demand[sink])
+            for k, state in path:
+                if cost[k][state] < 0:
+                    amount = min(amount, -flow[k][state])
+            if amount <= _FLOW_EPSILON:
+                continue
+
+            for k, state in path:
+                flow[k][state] += amount
+                flow[k][neighbors[k][state]] -= amount
+            supply[source] -= amount
+            demand[sink] -= amount
+
+    # Each edge's flow is recorded once in each direction.
+    return np.abs(flow).sum() / 2
+
+
 def l1(d1, d2):
     """Return the L1 distance between two distributions.
 
@@ -473,7 +693,7 @@ def l1(d1, d2):
     Returns:
         float: The sum of absolute differences of ``d1`` and ``d2``.
     """
-    return np.absolute(d1 - d2).sum()
+    return np.absolute(np.asarray(d1) - np.asarray(d2)).sum()
 
 
 def bipartition(a):
@@ -606,29 +826,14 @@ def bipartition_indices(N):
 # Internal helper methods
 # =============================================================================
 
-def load_data(dir, num):
-    """Load numpy data from the data directory.
-
-    The files should stored in ``data/{dir}`` and named
-    ``0.npy, 1.npy, ... {num - 1}.npy``.
-
-    Returns:
-        list: A list of loaded data, such that ``list[i]`` contains the
-        the contents of ``i.npy``.
-    """
-
+def _data_path(dir, i):
+    """Return the path of ``i.npy`` in the ``data/{dir}`` directory."""
     root = os.path.abspath(os.path.dirname(__file__))
+    return os.path.join(root, 'data', dir, str(i) + '.npy')
 
-    def get_path(i):
-        return os.path.join(root, 'data', dir, str(i) + '.npy')
-
-    return [np.load(get_path(i)) for i in range(num)]
 
-
-# Load precomputed hamming matrices.
-_NUM_PRECOMPUTED_HAMMING_MATRICES = 10
-_hamming_matrices = load_data('hamming_matrices',
-                              _NUM_PRECOMPUTED_HAMMING_MATRICES)
+# Hamming matrices that have been loaded, keyed by the number of nodes.
+_hamming_matrices = {}
 
 
 # TODO extend to nonbinary nodes
@@ -650,22 +855,51 @@ def _hamming_matrix(N):
                [ 1.,  2.,  0.,  1.],
                [ 2.,  1.,  1.,  0.]])
     """
-    if N < _NUM_PRECOMPUTED_HAMMING_MATRICES:
-        return _hamming_matrices[N]
-    else:
-        log.warn(
-            "Hamming matrices for more than {} nodes have not been "
-            "precomputed. This will make EMD calculations less inefficient; "
-            "calculating hamming matrices is an exponential-time procedure. "
-            "Consider pre-computing the hamming matrices up to the desired "
-            "number of nodes with the ``pyphi.utils._hamming_matrix`` "
-            "function and saving them to the 'data' directory in the "
-            "directory where PyPhi was installed (you can find this directory "
-            "by typing ``import pyphi; pyphi;`` into a Python interperter)."
-            .format(_NUM_PRECOMPUTED_HAMMING_MATRICES - 1)
-        )
-        possible_states = np.array(list(all_states((N))))
-        return cdist(possible_states, possible_states, 'hamming') * N
+    if N not in _hamming_matrices:
+        _hamming_matrices[N] = _load_hamming_matrix(N)
+    return _hamming_matrices[N]
+
+
+def _load_hamming_matrix(N):
+    """Memory-map the Hamming matrix for |N| nodes, computing and saving it
+    first if it is neither shipped with PyPhi nor in the cache directory.
+
+    Matrices are mapped copy-on-write, so processes share the pages of a
+    matrix rather than each holding a copy. They are returned as plain arrays
+    viewing the mapping, so that arrays computed from them are not memmaps.
+    """
+    paths = [_data_path('hamming_matrices', N),
+             os.path.join(config.FS_CACHE_DIRECTORY, 'hamming_matrices',
+                          str(N) + '.npy')]
+    for path in paths:
+        if os.path.exists(path):
+            return np.load(path, mmap_mode='c').view(np.ndarray)
+
+    log.info('Computing the Hamming matrix for {} nodes.'.format(N))
+    matrix = _compute_hamming_matrix(N)
+    path = paths[-1]
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Save atomically, since other processes may be loading the matrix.
+        tmp_path = '{}.{}.tmp'.format(path, os.getpid())
+        with open(tmp_path, 'wb') as f:
+            np.save(f, matrix)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        log.warning('Could not cache the Hamming matrix for {} nodes: '
+                    '{}'.format(N, e))
+        return matrix
+    return np.load(path, mmap_mode='c').view(np.ndarray)
+
+
+def _compute_hamming_matrix(N):
+    """Compute the Hamming matrix for |N| nodes."""
+    states = np.arange(2**N)
+    different = states[:, np.newaxis] ^ states
+    matrix = np.zeros(different.shape)
+    for i in range(N):
+        matrix += (different >> i) & 1
+    return matrix
 
 
 # TODO: better name?
@@ -794,6 +1028,8 @@ def strongly_connected(cm, nodes=None):
         nodes (tuple[int]): An optional subset of node indices to test strong
             connectivity over.
     """
+    from scipy.sparse.csgraph import connected_components
+
     if nodes is not None:
         cm = cm[np.ix_(nodes, nodes)]
 
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 # conftest.py
 
+import importlib
 import pytest
 import os
 import shutil
@@ -24,8 +25,8 @@ BACKUP_CACHE_DIR = config.FS_CACHE_DIRECTORY + '.BACKUP'
 
 
 def _flush_joblib_cache():
-    # Remove the old joblib cache directory.
-    shutil.rmtree(config.FS_CACHE_DIRECTORY)
+    # Remove the old joblib cache directory, if it has been created.
+    shutil.rmtree(config.FS_CACHE_DIRECTORY, ignore_errors=True)
     # Make a new, empty one.
     os.mkdir(config.FS_CACHE_DIRECTORY)
 
@@ -47,6 +48,15 @@ def flushcache():
     return cache_flusher
 
 
+@pytest.fixture
+def big_phi_module():
+    """The `pyphi.compute.big_phi` module, for patching its functions.
+
+    `pyphi.compute.big_phi` is the re-exported function, not the module.
+    """
+    return importlib.import_module('pyphi.compute.big_phi')
+
+
 @pytest.fixture(scope="session")
 def restore_fs_cache(request):
     """Temporarily backup, then restore, the user's joblib cache after each
@@ -58,13 +68,15 @@ def restore_fs_cache(request):
             raise Exception("You must move the backup of the filesystem cache "
                             "at " + BACKUP_CACHE_DIR + " before running the "
                             "test suite.")
+        # Importing PyPhi no longer creates the cache directory.
+        os.makedirs(config.FS_CACHE_DIRECTORY, exist_ok=True)
         shutil.move(config.FS_CACHE_DIRECTORY, BACKUP_CACHE_DIR)
         os.mkdir(config.FS_CACHE_DIRECTORY)
 
     def fin():
         if config.CACHING_BACKEND == constants.FILESYSTEM:
             # Remove the tests' joblib cache directory.
-            shutil.rmtree(config.FS_CACHE_DIRECTORY)
+            shutil.rmtree(config.FS_CACHE_DIRECTORY, ignore_errors=True)
             # Restore the old joblib cache.
             shutil.move(BACKUP_CACHE_DIR,
                         config.FS_CACHE_DIRECTORY)
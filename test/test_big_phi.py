@@ -3,15 +3,19 @@
 # test_big_phi.py
 
 import pickle
+
+import numpy as np
 import pytest
 from unittest.mock import patch
 
-from pyphi import constants, config, compute, models, utils, Network, Subsystem
+from pyphi import (constants, config, compute, examples, models, utils,
+                   Network, Subsystem)
 from pyphi.constants import DIRECTIONS, PAST, FUTURE
 from pyphi.models import Cut, _null_bigmip
 from pyphi.compute import constellation
 from pyphi.compute.big_phi import (_find_mip_parallel, _find_mip_sequential,
-                                   big_mip_bipartitions)
+                                   automorphisms, big_mip_bipartitions,
+                                   order_cuts, symmetric_cut_representatives)
 
 # TODO: split these into `concept` and `big_phi` tests
 
@@ -570,3 +574,252 @@ def test_big_mip_bipartitions():
                   models.Cut((1, 3, 4), (2,)),
                   models.Cut((2, 3, 4), (1,))]
         assert big_mip_bipartitions((1, 2, 3, 4)) == answer
+
+
+def test_automorphisms_asymmetric_subsystem(s):
+    assert automorphisms(s) == [{0: 0, 1: 1, 2: 2}]
+
+
+def _generated_group(generators):
+    """Return all permutations generated by the given ones."""
+    group = {tuple(sorted(g.items())) for g in generators}
+    frontier = list(group)
+    while frontier:
+        a = dict(frontier.pop())
+        for b in generators:
+            product = tuple(sorted((k, b[v]) for k, v in a.items()))
+            if product not in group:
+                group.add(product)
+                frontier.append(product)
+    return group
+
+
+def test_automorphisms_xor():
+    subsystem = examples.xor_subsystem()
+    # All permutations of the three XOR gates in state (0, 0, 0)
+    generators = automorphisms(subsystem)
+    assert generators == [{0: 0, 1: 1, 2: 2}, {0: 1, 1: 0, 2: 2},
+                          {0: 2, 1: 0, 2: 1}, {0: 0, 1: 2, 2: 1}]
+    assert len(_generated_group(generators)) == 6
+    # Only A and B can be swapped if their state differs from C's
+    subsystem = Subsystem(subsystem.network, (1, 1, 0), range(3))
+    assert automorphisms(subsystem) == [{0: 0, 1: 1, 2: 2},
+                                        {0: 1, 1: 0, 2: 2}]
+
+
+def test_symmetric_cut_representatives():
+    cuts = big_mip_bipartitions((0, 1, 2))
+    symmetries = automorphisms(examples.xor_subsystem())
+    assert symmetric_cut_representatives(cuts, symmetries) == [
+        Cut((0,), (1, 2)), Cut((0, 1), (2,))]
+    identity = [{0: 0, 1: 1, 2: 2}]
+    assert symmetric_cut_representatives(cuts, identity) == cuts
+
+
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_big_mip_skip_symmetric_cuts(flushcache, restore_fs_cache):
+    subsystem = Subsystem(examples.xor_network(), (1, 1, 0), range(3))
+    with config.override(SKIP_SYMMETRIC_CUTS=True):
+        mip = compute.big_mip(subsystem)
+    flushcache()
+    with config.override(SKIP_SYMMETRIC_CUTS=False):
+        answer = compute.big_mip(subsystem)
+    assert mip.phi == answer.phi
+    assert mip.cut == answer.cut
+
+
+def test_order_cuts(s):
+    cuts = big_mip_bipartitions(s.node_indices)
+    with config.override(CUT_ORDERING='none'):
+        assert order_cuts(s, cuts, ()) == cuts
+    with config.override(CUT_ORDERING='severed_connections'):
+        assert order_cuts(s, cuts, ()) == [
+            Cut((0,), (1, 2)), Cut((0, 2), (1,)), Cut((1,), (0, 2)),
+            Cut((0, 1), (2,)), Cut((2,), (0, 1)), Cut((1, 2), (0,))]
+    with config.override(CUT_ORDERING='nonexistent'):
+        with pytest.raises(ValueError):
+            order_cuts(s, cuts, ())
+
+
+def test_damaged_concepts_ordering(s):
+    unpartitioned_constellation = constellation(s)
+    cuts = big_mip_bipartitions(s.node_indices)
+
+    def damaged(cut):
+        cut_subsystem = s.apply_cut(cut)
+        return sum(1 for concept in unpartitioned_constellation
+                   if concept.cause.damaged_by_cut(cut_subsystem) or
+                   concept.effect.damaged_by_cut(cut_subsystem))
+
+    with config.override(CUT_ORDERING='damaged_concepts'):
+        ordered = order_cuts(s, cuts, unpartitioned_constellation)
+    assert ordered == sorted(cuts, key=damaged)
+
+
+@pytest.mark.parametrize('ordering', ['severed_connections',
+                                      'damaged_concepts'])
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_big_mip_cut_ordering(ordering, s, flushcache, restore_fs_cache):
+    flushcache()
+    with config.override(CUT_ORDERING=ordering):
+        mip = compute.big_mip(s)
+    assert mip.phi == standard_answer['phi']
+
+
+def test_evaluate_cut_reuses_unaffected_concepts(s):
+    unpartitioned_constellation = constellation(s)
+    for cut in big_mip_bipartitions(s.node_indices):
+        mip = compute.evaluate_cut(s, cut, unpartitioned_constellation)
+        cut_subsystem = s.apply_cut(cut)
+        for concept in unpartitioned_constellation:
+            if not (concept.cause.damaged_by_cut(cut_subsystem) or
+                    concept.effect.damaged_by_cut(cut_subsystem)):
+                assert any(c is concept
+                           for c in mip.partitioned_constellation)
+        # Same result as recomputing every concept
+        mechanisms = set([c.mechanism for c in unpartitioned_constellation] +
+                         list(cut.all_cut_mechanisms()))
+        answer = compute.constellation_distance(
+            unpartitioned_constellation,
+            constellation(cut_subsystem, mechanisms))
+        assert mip.phi == round(answer, config.PRECISION)
+
+
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_big_mip_budgets(s, flushcache, restore_fs_cache):
+    flushcache()
+    mip = compute.big_mip(s)
+    assert mip.cuts_evaluated == 6
+    assert not mip.upper_bound
+
+    mip = compute.big_mip(s, cut_budget=2)
+    assert mip.cuts_evaluated == 2
+    assert mip.upper_bound
+    assert mip.phi >= standard_answer['phi']
+
+    # At least one cut is evaluated even if the budget is already exhausted
+    mip = compute.big_mip(s, time_budget=0)
+    assert mip.cuts_evaluated == 1
+    assert mip.upper_bound
+
+
+def test_big_mip_budget_reducible(reducible, flushcache, restore_fs_cache):
+    mip = compute.big_mip(reducible, cut_budget=1)
+    assert mip.phi == 0
+    assert not mip.upper_bound
+
+
+# Cuts with equal phi are tied by whichever finishes first when they are
+# evaluated in parallel, so the MIPs are only reproducible sequentially.
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_iter_complexes(s, flushcache, restore_fs_cache):
+    flushcache()
+    answer = compute.complexes(s.network, s.state)
+    results = list(compute.iter_complexes(s.network, s.state))
+    assert tuple(mip for mip, main in results) == answer
+    # The running maximum ends at the main complex
+    assert [main for mip, main in results][-1] == max(answer)
+    assert compute.main_complex(s.network, s.state) == max(answer)
+
+
+@config.override(PARALLEL_COMPLEX_EVALUATION=True,
+                 PARALLEL_CUT_EVALUATION=False)
+def test_iter_complexes_parallel(s, flushcache, restore_fs_cache):
+    flushcache()
+    with config.override(PARALLEL_COMPLEX_EVALUATION=False):
+        answer = compute.complexes(s.network, s.state)
+    results = list(compute.iter_complexes(s.network, s.state))
+    assert set(mip for mip, main in results) == set(answer)
+    assert results[-1][1].phi == max(answer).phi
+
+
+@pytest.mark.parametrize('network,state', [
+    (examples.basic_network(), (1, 0, 0)),
+    (examples.xor_network(), (1, 1, 0)),
+    (examples.residue_network(), (0, 0, 0, 0, 0)),
+])
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_main_complex_branch_and_bound(network, state, flushcache,
+                                       restore_fs_cache):
+    flushcache()
+    answer = compute.complexes(network, state)
+    result = compute.main_complex(network, state)
+    if answer:
+        assert result == max(answer)
+    else:
+        assert not result
+
+
+@config.override(CACHE_BIGMIPS=True, PARALLEL_CUT_EVALUATION=False)
+def test_main_complex_uses_big_mip_if_caching(s, flushcache,
+                                              restore_fs_cache,
+                                              big_phi_module):
+    flushcache()
+    with patch.object(big_phi_module, 'big_mip',
+                      wraps=big_phi_module.big_mip) as big_mip:
+        result = compute.main_complex(s.network, s.state)
+    # No subsystem is bounded, so every one goes through `big_mip`.
+    subsystems = list(compute.possible_complexes(s.network, s.state))
+    assert big_mip.call_count == len(subsystems)
+    assert result.phi == max(compute.complexes(s.network, s.state)).phi
+
+
+@pytest.mark.parametrize('parallel', [False, True])
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_state_sweep(parallel, flushcache, restore_fs_cache):
+    network = examples.basic_network()
+    states = [(1, 0, 0), (0, 0, 0), (1, 0, 0)]
+    with config.override(PARALLEL_STATE_EVALUATION=parallel):
+        table = compute.state_sweep(network, states)
+    assert [tuple(row) for row in table['state']] == states
+    for row, state in zip(table, states):
+        main = compute.main_complex(network, state)
+        assert row['phi'] == main.phi
+        assert (tuple(np.where(row['main_complex'])[0]) ==
+                main.subsystem.node_indices)
+
+
+@config.override(PARALLEL_CUT_EVALUATION=False,
+                 PARALLEL_STATE_EVALUATION=False)
+def test_state_sweep_reuses_big_mips(flushcache, restore_fs_cache,
+                                     big_phi_module):
+    network = examples.basic_network()
+    # Only the state of node 0 differs, which node 1 does not depend on.
+    states = [(1, 0, 0), (0, 0, 0)]
+    with patch.object(big_phi_module, 'Subsystem',
+                      wraps=big_phi_module.Subsystem) as new:
+        compute.state_sweep(network, states)
+    evaluated = [call[0][2] for call in new.call_args_list]
+    assert evaluated.count((1,)) == 1
+    assert evaluated.count((0, 1, 2)) == 2
+
+
+def test_state_sweep_reachable_states():
+    network = examples.basic_network()
+    with config.override(PARALLEL_STATE_EVALUATION=False):
+        table = compute.state_sweep(network)
+    reachable = [state for state in utils.all_states(network.size)
+                 if np.any(np.all(network.tpm == state, axis=-1))]
+    assert [tuple(row) for row in table['state']] == reachable
+
+
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_trajectory(flushcache, restore_fs_cache):
+    flushcache()
+    network = examples.residue_network()
+    states = [(0, 0, 0, 0, 0), (0, 0, 0, 1, 1), (0, 0, 0, 0, 1),
+              (0, 0, 0, 0, 0)]
+    table = compute.trajectory(network, states)
+    assert [tuple(row) for row in table['state']] == states
+    for row, state in zip(table, states):
+        main = compute.main_complex(network, state)
+        assert row['phi'] == main.phi
+        assert (tuple(np.where(row['main_complex'])[0]) ==
+                main.subsystem.node_indices)
+
+
+def test_trajectory_simulated():
+    network = examples.basic_network()
+    table = compute.trajectory(network, (1, 0, 0), steps=3)
+    assert [tuple(row) for row in table['state']] == [
+        (1, 0, 0), (0, 0, 1), (1, 1, 0), (1, 0, 0)]
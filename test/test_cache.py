@@ -1,8 +1,9 @@
 import functools
+import pickle
 from unittest import mock
 import pytest
 import redis
-from pyphi import cache, config, examples, models, Subsystem
+from pyphi import cache, config, examples, macro, models, utils, Subsystem
 
 
 def test_cache():
@@ -40,6 +41,58 @@ class SomeObject:
         return 'expensive computation'
 
 
+@config.override(MAXIMUM_CACHE_BYTES=3000)
+def test_cache_evicts_least_recently_used():
+    c = cache.DictCache()
+    value = bytes(900)
+    size = cache.sizeof(value)
+    assert 2 * size <= 3000 < 4 * size
+
+    for key in range(3):
+        c.set(key, value)
+    assert c.nbytes == 3 * size
+    c.get(0)
+    c.set(3, value)
+    # Key 1 was the least recently used.
+    assert list(c.cache) == [2, 0, 3]
+    assert c.nbytes == 3 * size
+
+    # Values larger than the budget are not cached.
+    c.set(4, bytes(4000))
+    assert 4 not in c.cache
+    assert c.nbytes == 3 * size
+
+
+@config.override(MAXIMUM_CACHE_BYTES=3000)
+def test_caches_share_budget():
+    a, b = cache.DictCache(), cache.DictCache()
+    value = bytes(900)
+    size = cache.sizeof(value)
+
+    a.set(0, value)
+    a.set(1, value)
+    b.set(0, value)
+    b.set(1, value)
+    # The oldest value of either cache is evicted.
+    assert list(a.cache) == [1]
+    assert list(b.cache) == [0, 1]
+    assert cache._ledger.nbytes <= 3000
+
+    # The values of collected caches no longer count against the budget.
+    del b
+    a.set(2, value)
+    a.set(3, value)
+    assert list(a.cache) == [1, 2, 3]
+    assert a.nbytes == 3 * size
+
+
+def test_sizeof_includes_repertoires(s):
+    mice = s.find_mice('past', (0, 1))
+    repertoires = (mice.mip.unpartitioned_repertoire,
+                   mice.mip.partitioned_repertoire)
+    assert cache.sizeof(mice) > sum(r.nbytes for r in repertoires)
+
+
 def test_cache_decorator():
     o = SomeObject()
     assert o.cached_method(1) == 'expensive computation'
@@ -138,7 +191,8 @@ def test_mice_cache_keys(s):
     assert c.key('past', (0,), purviews=(0, 1)) == (None, 'past', (0,), (0, 1))
 
     c = cache.RedisMiceCache(s)
-    answer = 'subsys:{}:None:past:(0,):(0, 1)'.format(hash(s))
+    answer = 'subsys:{}:None:past:(0,):(0, 1)'.format(
+        utils.digest((s, config.result_options())))
     assert c.key('past', (0,), purviews=(0, 1)) == answer
 
 
@@ -235,6 +289,86 @@ def test_inherited_cache_must_come_from_uncut_subsystem(redis_cache, flush_redis
         cache.MiceCache(s, cut_s._mice_cache)
 
 
+@pytest.fixture
+def shared_cache(tmpdir, monkeypatch):
+    """Fixture to use a fresh shared Mice cache."""
+    monkeypatch.setattr(cache, '_shared_directory', str(tmpdir))
+    with config.override(REDIS_CACHE=False, SHARED_MICE_CACHE=True):
+        yield
+
+
+def test_use_shared_mice_cache(shared_cache, s):
+    assert isinstance(cache.MiceCache(s), cache.SharedMiceCache)
+
+    # Macro subsystems are not identified by the key of a shared Mice
+    network = examples.macro_network()
+    coarse_grain = macro.CoarseGrain(((0, 1), (2, 3)),
+                                     (((0, 1), (2,)), ((0, 1), (2,))))
+    macro_s = macro.MacroSubsystem(network, (0, 0, 0, 0),
+                                   network.node_indices,
+                                   coarse_grain=coarse_grain)
+    assert type(macro_s._mice_cache) is cache.DictMiceCache
+    assert not isinstance(cache.MiceCache(macro_s), cache.SharedMiceCache)
+
+
+def test_shared_mice_cache_shares_mice_between_cuts(shared_cache):
+    s = examples.basic_subsystem()
+    mechanism = (1,)
+
+    # Does not cut the connections to 1
+    cut_s = Subsystem(s.network, s.state, s.node_indices,
+                      cut=models.Cut((1,), (0, 2)))
+    mice = cut_s.find_mice('past', mechanism)
+    assert mice.purview == (2,)
+
+    # Neither does this cut, nor the null cut
+    for cut in (models.Cut((0, 1), (2,)), None):
+        other_s = Subsystem(s.network, s.state, s.node_indices, cut=cut)
+        key = other_s._mice_cache.key('past', mechanism)
+        assert other_s._mice_cache.get(key) == mice
+        assert other_s._mice_cache.get(key).mip.subsystem is other_s
+
+    # Cuts connections from 2 -> 1
+    other_s = Subsystem(s.network, s.state, s.node_indices,
+                        cut=models.Cut((0, 2), (1,)))
+    key = other_s._mice_cache.key('past', mechanism)
+    assert other_s._mice_cache.get(key) is None
+
+
+def test_sqlite_store(tmpdir):
+    store = cache.SqliteStore(str(tmpdir.join('store.sqlite3')))
+    assert store.get('key') is None
+    store.set('key', b'value')
+    store.set('key', b'other value')  # ignored
+    assert store.get('key') == b'value'
+    assert store.size() == 1
+
+    # Other processes open their own connections
+    store = pickle.loads(pickle.dumps(store))
+    assert store.get('key') == b'value'
+    store.clear()
+    assert store.size() == 0
+
+
+def test_stored_mice_cache_is_abstract(s):
+    with pytest.raises(TypeError):
+        cache._StoredMiceCache(s)
+
+
+@config.override(REDIS_CACHE=False, PERSISTENT_MICE_CACHE=True)
+def test_persistent_mice_cache(tmpdir):
+    with config.override(FS_CACHE_DIRECTORY=str(tmpdir)):
+        s = examples.basic_subsystem()
+        assert isinstance(s._mice_cache, cache.PersistentMiceCache)
+        mice = s.find_mice('past', (1,))
+
+        # A new run finds the stored Mice
+        other_s = examples.basic_subsystem()
+        key = other_s._mice_cache.key('past', (1,))
+        assert other_s._mice_cache.get(key) == mice
+        assert cache.mice_store().size() == 1
+
+
 @local_cache
 @config.override(MAXIMUM_CACHE_MEMORY_PERCENTAGE=0)
 def test_mice_cache_respects_cache_memory_limits():
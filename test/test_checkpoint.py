@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_checkpoint.py
+
+from unittest.mock import patch
+
+import pytest
+
+from pyphi import compute, config
+from pyphi.compute.checkpoint import Checkpoint
+
+
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_big_mip_resume_from_budget(s, tmpdir, big_phi_module):
+    path = str(tmpdir.join('checkpoint'))
+    mip = compute.big_mip(s, cut_budget=2, checkpoint=path)
+    assert mip.upper_bound
+
+    progress = Checkpoint.load(path).get_progress(s)
+    assert len(progress.evaluated_cuts) == 2
+
+    # Only the remaining cuts are evaluated
+    constellation = big_phi_module.constellation
+    with patch.object(big_phi_module, 'constellation',
+                      wraps=constellation) as mock_constellation:
+        mip = compute.resume(path)
+        assert mock_constellation.call_count == 4
+    assert mip.cuts_evaluated == 6
+    assert not mip.upper_bound
+    assert mip.phi == 2.3125
+
+
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_main_complex_checkpoint(s, tmpdir, big_phi_module):
+    path = str(tmpdir.join('checkpoint'))
+    answer = compute.main_complex(s.network, s.state)
+    assert compute.main_complex(s.network, s.state, checkpoint=path) == answer
+
+    # Finished subsystems are not recomputed
+    with patch.object(big_phi_module, '_compute_big_mip') as mock_compute:
+        assert compute.resume(path) == answer
+        assert not mock_compute.called
+
+
+def test_checkpoint_of_different_computation(s, tmpdir):
+    path = str(tmpdir.join('checkpoint'))
+    Checkpoint(path, ('main_complex', s.network, s.state)).save()
+    Checkpoint.open(path, ('main_complex', s.network, s.state))
+    with pytest.raises(ValueError):
+        Checkpoint.open(path, ('main_complex', s.network, (0, 0, 0)))
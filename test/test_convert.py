@@ -136,3 +136,27 @@ def test_n_d_state_by_node2state_by_state():
     print("Expected:")
     print(expected)
     assert np.array_equal(result, expected)
+
+
+def test_nondet_state_by_node2state_by_state_cell_by_cell():
+    # Compare with the probability of each transition computed directly.
+    N = 4
+    sbn = np.random.RandomState(0).random_sample((2**N, N))
+    result = convert.state_by_node2state_by_state(sbn)
+    for i in range(2**N):
+        past_state = convert.loli_index2state(i, N)
+        marginal_tpm = convert.to_n_dimensional(sbn)[past_state]
+        for j in range(2**N):
+            current_state = np.array(convert.loli_index2state(j, N))
+            expected = (np.prod(marginal_tpm[current_state == 1]) *
+                        np.prod(1 - marginal_tpm[current_state == 0]))
+            assert result[i, j] == expected
+
+
+def test_state_by_state2state_by_node_round_trip():
+    N = 4
+    sbn = convert.to_n_dimensional(
+        np.random.RandomState(0).random_sample((2**N, N)))
+    sbs = convert.state_by_node2state_by_state(sbn)
+    assert np.allclose(sbs.sum(1), 1)
+    assert np.allclose(convert.state_by_state2state_by_node(sbs), sbn)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# test_import.py
+
+import json
+import os
+import subprocess
+import sys
+
+import pyphi
+
+# The maximum number of seconds that `import pyphi` may take.
+IMPORT_TIME_BUDGET = 2.0
+
+# Modules that are only imported once the features that need them are used.
+DEFERRED_MODULES = ['bson', 'joblib', 'marbl', 'psutil', 'pymongo', 'redis',
+                    'scipy.sparse']
+
+SCRIPT = '''
+import json, sys, time
+start = time.perf_counter()
+import pyphi
+duration = time.perf_counter() - start
+print(json.dumps({'duration': duration, 'modules': list(sys.modules)}))
+'''
+
+
+def test_import_is_lazy_and_side_effect_free(tmpdir):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(pyphi.__file__)))
+    env = dict(os.environ, PYTHONPATH=root)
+    output = subprocess.check_output([sys.executable, '-c', SCRIPT],
+                                     cwd=str(tmpdir), env=env)
+    result = json.loads(output.decode())
+
+    for module in DEFERRED_MODULES:
+        assert module not in result['modules']
+    # No log file or cache directory is created.
+    assert tmpdir.listdir() == []
+    assert result['duration'] < IMPORT_TIME_BUDGET
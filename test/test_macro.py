@@ -5,7 +5,7 @@
 import pytest
 
 import numpy as np
-from pyphi import convert, macro
+from pyphi import convert, macro, utils
 
 
 def test_all_partitions():
@@ -28,6 +28,28 @@ def test_all_partitions():
     ]
 
 
+def test_all_partitions_constraints():
+    assert list(macro.all_partitions((0, 1, 2, 3), max_blocks=2,
+                                     max_block_size=2)) == [
+        ((0, 1), (2, 3)),
+        ((0, 2), (1, 3)),
+        ((0, 3), (1, 2)),
+    ]
+    assert list(macro.all_partitions((0, 1, 2), max_block_size=2)) == [
+        ((0, 1), (2,)),
+        ((0, 2), (1,)),
+        ((0,), (1, 2)),
+    ]
+
+
+def test_partitions_beyond_precomputed_sizes():
+    # Bell numbers, less the partition into a single block.
+    assert sum(1 for partition in macro._partitions(10)) == 115974
+    assert sum(1 for partition in macro._partitions(11)) == 678569
+    partitions = macro._partitions(30, max_blocks=2)
+    assert next(partitions) == [list(range(29)), [29]]
+
+
 def test_all_groupings():
     assert list(macro.all_groupings(())) == [()]
     partition = ((0, 1), (2, 3))
@@ -101,6 +123,16 @@ def test_make_mapping():
     assert np.array_equal(mapping, np.array((0., 1., 1., 1., 1., 1., 1., 0.)))
 
 
+def test_make_mapping_matches_macro_state():
+    partition = ((3,), (1, 4))
+    grouping = (((0,), (1,)), ((0, 2), (1,)))
+    coarse_grain = macro.CoarseGrain(partition, grouping)
+    mapping = coarse_grain.make_mapping()
+    for i, micro_state in enumerate(utils.all_states(3)):
+        macro_state = coarse_grain.macro_state(micro_state)
+        assert mapping[i] == convert.state2loli_index(macro_state)
+
+
 def test_make_macro_tpm():
     answer_tpm = convert.state_by_state2state_by_node(np.array([
         [0.375,  0.375,  0.125,  0.125],
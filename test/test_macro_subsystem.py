@@ -5,7 +5,7 @@ import numpy as np
 import pytest
 
 import pyphi
-from pyphi import convert, macro, models, utils
+from pyphi import config, convert, macro, models, utils
 from pyphi.convert import (state_by_node2state_by_state as sbn2sbs,
                            state_by_state2state_by_node as sbs2sbn)
 
@@ -44,6 +44,21 @@ def test_cut_indices(macro_subsystem, s):
     assert micro.cut_indices == (0, 1, 2)
 
 
+def test_digest(macro_subsystem):
+    network = macro_subsystem.network
+    state = macro_subsystem._network_state
+    micro = macro.MacroSubsystem(network, state, network.node_indices)
+    assert micro.digest != macro_subsystem.digest
+    assert (micro.digest !=
+            pyphi.Subsystem(network, state, network.node_indices).digest)
+
+    grouping = (((0,), (1, 2)), ((0,), (1, 2)))
+    coarse_grain = macro.CoarseGrain(((0, 1), (2, 3)), grouping)
+    other = macro.MacroSubsystem(network, state, network.node_indices,
+                                 coarse_grain=coarse_grain)
+    assert other.digest != macro_subsystem.digest
+
+
 def test_pass_node_indices_as_a_range(s):
     # Test that node_indices can be a `range`
     macro.MacroSubsystem(s.network, s.state, range(s.size))
@@ -325,6 +340,24 @@ def test_blackbox_emergence():
     assert result.emergence == 0.599789
 
 
+@pytest.mark.slow
+@config.override(PARALLEL_CUT_EVALUATION=False)
+def test_parallel_emergence(flushcache, restore_fs_cache):
+    flushcache()
+    network = pyphi.examples.basic_network()
+    state = (1, 0, 0)
+    with config.override(PARALLEL_MACRO_EVALUATION=False):
+        sequential = macro.emergence(network, state)
+        sequential_grain = macro.coarse_grain(network, state, (0, 1, 2))
+    with config.override(PARALLEL_MACRO_EVALUATION=True):
+        parallel = macro.emergence(network, state)
+        parallel_grain = macro.coarse_grain(network, state, (0, 1, 2))
+    assert parallel.phi == sequential.phi
+    assert parallel.system == sequential.system
+    assert parallel.coarse_grain == sequential.coarse_grain
+    assert parallel_grain == sequential_grain
+
+
 def test_macro2micro(s):
     # Only blackboxing
     blackbox = macro.Blackbox(((0, 2), (1,)), (1, 2))
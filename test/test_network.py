@@ -85,3 +85,11 @@ def test_repr(standard):
 
 def test_str(standard):
     print(str(standard))
+
+
+def test_digest(standard):
+    network = Network(standard.tpm, standard.cm)
+    assert network.digest == standard.digest
+    assert hash(network) == hash(standard)
+    network.perturb_vector = [0.25, 0.5, 0.5]
+    assert network.digest != standard.digest
@@ -2,9 +2,12 @@
 # -*- coding: utf-8 -*-
 # test_parallel.py
 
-import pytest
+import os
 from unittest.mock import patch
 
+import numpy as np
+import pytest
+
 from pyphi import config
 from pyphi.compute import parallel
 
@@ -30,3 +33,84 @@ def test_num_processes_with_negative_number_of_cores():
 def test_num_processes_with_too_many_cores():
     with pytest.raises(ValueError):
         parallel.get_num_processes()
+
+
+def _affine(a, b, x):
+    return a * x + b
+
+
+def _fail(x):
+    raise ValueError(x)
+
+
+@config.override(NUMBER_OF_CORES=1)
+def test_worker_pool_is_reused():
+    pool = parallel.get_pool()
+    assert sorted(pool.imap_unordered(_affine, range(4), 2, 1)) == [1, 3, 5, 7]
+    assert parallel.get_pool() is pool
+    assert sorted(pool.imap_unordered(_affine, range(2), 3, 0)) == [0, 3]
+
+
+@config.override(NUMBER_OF_CORES=1)
+def test_worker_pool_cancel_keeps_workers():
+    pool = parallel.get_pool()
+    results = pool.imap_unordered(_affine, range(100), 1, 0)
+    next(results)
+    results.close()
+    assert pool.alive()
+    # Results of the cancelled items are not returned
+    assert sorted(pool.imap_unordered(_affine, range(3), 1, 0)) == [0, 1, 2]
+
+
+@config.override(NUMBER_OF_CORES=1)
+def test_worker_pool_rejects_concurrent_computations():
+    pool = parallel.get_pool()
+    results = pool.imap_unordered(_affine, range(3), 1, 0)
+    first = next(results)
+    with pytest.raises(RuntimeError):
+        next(pool.imap_unordered(_affine, range(3), 2, 0))
+    # The running computation is not disturbed.
+    assert sorted([first] + list(results)) == [0, 1, 2]
+    assert sorted(pool.imap_unordered(_affine, range(2), 2, 0)) == [0, 2]
+
+
+@config.override(NUMBER_OF_CORES=1)
+def test_worker_pool_reraises_errors():
+    pool = parallel.get_pool()
+    with pytest.raises(ValueError):
+        list(pool.imap_unordered(_fail, range(3)))
+    assert pool.alive()
+    parallel.shutdown_pool()
+    assert not pool.alive()
+
+
+def _sum(array, x):
+    return array.sum() + x
+
+
+def test_array_store_shares_large_arrays():
+    store = parallel._ArrayStore()
+    large = np.arange(2 ** 12, dtype=float)
+    small = np.arange(4)
+    data, keys = store.dumps((large, large, small))
+    # Equal arrays are stored once; small arrays are pickled
+    assert len(keys) == 1
+
+    views = {}
+    loaded = parallel._loads(data, store.directory, views)
+    assert np.array_equal(loaded[0], large)
+    assert loaded[0] is loaded[1]
+    assert not loaded[0].flags.writeable
+    assert np.array_equal(loaded[2], small)
+
+    store.prune(set())
+    assert not os.listdir(store.directory)
+    store.close()
+    assert not os.path.exists(store.directory)
+
+
+@config.override(NUMBER_OF_CORES=1)
+def test_worker_pool_shares_arrays():
+    pool = parallel.get_pool()
+    array = np.ones(2 ** 12)
+    assert sorted(pool.imap_unordered(_sum, range(2), array)) == [4096, 4097]
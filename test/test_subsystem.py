@@ -2,6 +2,9 @@
 # -*- coding: utf-8 -*-
 # test_subsystem.py
 
+import os
+import subprocess
+import sys
 from unittest import mock
 
 import numpy as np
@@ -81,6 +84,31 @@ def test_hash(s):
     print(hash(s))
 
 
+def test_digest(s):
+    other = Subsystem(s.network, s.state, s.node_indices)
+    assert other.digest == s.digest
+    assert hash(other) == hash(s)
+    cut_s = Subsystem(s.network, s.state, s.node_indices,
+                      cut=Cut((0,), (1, 2)))
+    assert cut_s.digest != s.digest
+
+
+DIGEST_SCRIPT = """
+from pyphi import examples
+print(examples.basic_subsystem().digest, hash(examples.basic_subsystem()))
+"""
+
+
+def test_digest_is_the_same_in_every_process():
+    outputs = [
+        subprocess.check_output(
+            [sys.executable, '-c', DIGEST_SCRIPT],
+            env=dict(os.environ, PYTHONHASHSEED=str(seed)))
+        for seed in (1, 2)
+    ]
+    assert outputs[0] == outputs[1]
+
+
 def test_find_cut_matrix(s, big_subsys_0_thru_3):
     cut = Cut((0, ), (1, 2))
     cut_s = Subsystem(s.network, s.state, s.node_indices, cut=cut)
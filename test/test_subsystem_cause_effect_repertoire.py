@@ -5,8 +5,9 @@
 import pytest
 import numpy as np
 
-from pyphi.models import Cut
-from pyphi import Subsystem
+from pyphi.models import Cut, FactoredRepertoire
+from pyphi import Subsystem, utils
+from pyphi.subsystem import effect_emd
 
 import example_networks
 
@@ -358,4 +359,41 @@ def test_cause_and_effect_repertoire(function, subsystem, mechanism, purview,
     assert np.array_equal(result, expected)
 
 
+def test_cause_repertoires_matches_cause_repertoire():
+    subsystem = example_networks.s()
+    mechanism = (0, 1)
+    purviews = tuple(utils.powerset(subsystem.node_indices))
+
+    batched = subsystem.cause_repertoires(mechanism, purviews)
+    assert subsystem.repertoire_cache_info().currsize == len(purviews)
+
+    fresh = example_networks.s()
+    for purview, repertoire in zip(purviews, batched):
+        assert np.array_equal(repertoire,
+                              fresh.cause_repertoire(mechanism, purview))
+        # Batched repertoires are retrieved from the cache
+        assert subsystem.cause_repertoire(mechanism, purview) is repertoire
+
+
+def test_effect_repertoire_is_factored():
+    subsystem = example_networks.s()
+    mechanism = (0, 1)
+    purview = (0, 2)
+
+    repertoire = subsystem.effect_repertoire(mechanism, purview)
+    assert isinstance(repertoire, FactoredRepertoire)
+    assert repertoire.purview == purview
+    assert repertoire.shape == np.asarray(repertoire).shape == (2, 1, 2)
+
+    # Factored products stay factored
+    partitioned = (subsystem.effect_repertoire((0,), (0,)) *
+                   subsystem.effect_repertoire((1,), (2,)))
+    assert isinstance(partitioned, FactoredRepertoire)
+    assert partitioned.purview == purview
+
+    # The EMD computed from the factors matches the dense computation
+    assert np.isclose(effect_emd(repertoire, partitioned),
+                      effect_emd(np.asarray(repertoire),
+                                 np.asarray(partitioned)))
+
 # vim: set foldmarker={{{,}}} foldlevel=0  foldmethod=marker :
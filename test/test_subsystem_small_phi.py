@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import itertools
 import pytest
 from pprint import pprint
 import numpy as np
 
-from pyphi import constants
+from pyphi import config, constants, utils
 from pyphi.models import Mip, Part
 
 import example_networks
@@ -242,6 +243,23 @@ def test_find_mip(direction, subsystem, cut, mechanism, purview, expected):
     else:
         assert result == expected
 
+
+@pytest.mark.parametrize('l1', [False, True])
+@pytest.mark.parametrize('direction', ['past', 'future'])
+def test_vectorized_find_mip_matches_sequential(s, direction, l1):
+    # Exclude the empty mechanism
+    mechanisms = list(utils.powerset(s.node_indices))[1:]
+    purviews = list(utils.powerset(s.node_indices))
+    with config.override(L1_DISTANCE_APPROXIMATION=l1):
+        for mechanism, purview in itertools.product(mechanisms, purviews):
+            with config.override(VECTORIZED_MIP_EVALUATION=False):
+                sequential = s.find_mip(direction, mechanism, purview)
+            with config.override(VECTORIZED_MIP_EVALUATION=True):
+                vectorized = s.find_mip(direction, mechanism, purview)
+            assert sequential == vectorized
+            assert sequential.phi == vectorized.phi
+            assert sequential.partition == vectorized.partition
+
 # }}}
 
 
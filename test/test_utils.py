@@ -4,7 +4,7 @@
 import numpy as np
 import pytest
 
-from pyphi import utils, constants, models
+from pyphi import config, constants, examples, models, utils
 
 
 def test_apply_cut():
@@ -38,6 +38,25 @@ def test_fully_connected():
     assert utils.fully_connected(cm, (0, 1, 2), (0, 1, 2))
 
 
+def test_digest():
+    a = np.arange(6).reshape(2, 3)
+    assert utils.digest(a) == utils.digest(np.asfortranarray(a))
+    assert utils.digest(a) == utils.digest(a.astype('>i8'))
+    assert utils.digest(a) != utils.digest(a.reshape(3, 2))
+    assert utils.digest(a) != utils.digest(a.astype(float))
+
+    assert utils.digest((1, 'a')) == utils.digest((1, 'a'))
+    assert utils.digest((1, 'a')) != utils.digest([1, 'a'])
+    assert utils.digest((1, 1)) != utils.digest(((1,), 1))
+    assert utils.digest(1) != utils.digest(1.0)
+    assert utils.digest(1) != utils.digest(True)
+    assert utils.digest(models.Cut((0,), (1,))) != utils.digest(((0,), (1,)))
+    assert utils.digest({'a': 1, 'b': 2}) == utils.digest({'b': 2, 'a': 1})
+
+    with pytest.raises(TypeError):
+        utils.digest(object())
+
+
 def test_phi_eq():
     phi = 0.5
     close_enough = phi - constants.EPSILON/2
@@ -110,6 +129,24 @@ def test_hamming_matrix():
     assert (H == answer).all()
 
 
+def test_compute_hamming_matrix():
+    for N in range(6):
+        assert np.array_equal(utils._compute_hamming_matrix(N),
+                              utils._hamming_matrix(N))
+
+
+def test_hamming_matrix_is_cached(tmpdir, monkeypatch):
+    monkeypatch.setattr(utils, '_hamming_matrices', {})
+    with config.override(FS_CACHE_DIRECTORY=str(tmpdir)):
+        H = utils._hamming_matrix(10)
+        assert tmpdir.join('hamming_matrices', '10.npy').check()
+        assert utils._hamming_matrix(10) is H
+        monkeypatch.setattr(utils, '_hamming_matrices', {})
+        assert np.array_equal(utils._hamming_matrix(10), H)
+    assert H[0, -1] == 10
+    assert np.array_equal(H, H.T)
+
+
 def test_directed_bipartition():
     answer = [((), (1, 2, 3)), ((1,), (2, 3)), ((2,), (1, 3)), ((1, 2), (3,)),
               ((3,), (1, 2)), ((1, 3), (2,)), ((2, 3), (1,)), ((1, 2, 3), ())]
@@ -131,6 +168,25 @@ def test_emd_validates_distribution_shapes():
         utils.hamming_emd(a, b)
 
 
+def test_hypercube_emd_matches_dense_emd():
+    np.random.seed(0)
+    for N in range(1, 6):
+        a = np.random.rand(*[2] * N)
+        b = np.random.rand(*[2] * N)
+        a, b = a / a.sum(), b / b.sum()
+        dense = utils.emd(a.ravel(), b.ravel(), utils._hamming_matrix(N))
+        assert abs(utils.hypercube_emd(a, b) - dense) < 10 * constants.EPSILON
+
+
+def test_hypercube_emd_is_selectable():
+    a = np.array([[1, 0], [0, 0]]).reshape(2, 1, 2)
+    b = np.array([[0, 0], [0, 1]]).reshape(2, 1, 2)
+    with config.override(HAMMING_EMD_SOLVER='hypercube'):
+        assert utils.hamming_emd(a, b) == 2.0
+    with pytest.raises(ValueError):
+        utils.hypercube_emd(np.ones((2, 2)) / 4, np.ones((2, 2, 2)) / 8)
+
+
 def test_l1_distance():
     a = np.array([0, 1, 2])
     b = np.array([2, 2, 4.5])
@@ -384,3 +440,13 @@ def test_purview_size(s):
     for mechanism, purview in zip(mechanisms, purviews):
         repertoire = s.cause_repertoire(mechanism, purview)
         assert utils.purview_size(repertoire) == len(purview)
+
+
+def test_simulate():
+    tpm = examples.basic_network().tpm
+    states = utils.simulate(tpm, (1, 0, 0), 3)
+    assert states == [(1, 0, 0), (0, 0, 1), (1, 1, 0), (1, 0, 0)]
+
+    tpm = np.full([2, 2, 2], 0.5)
+    assert (utils.simulate(tpm, (0, 0), 10, seed=1) ==
+            utils.simulate(tpm, (0, 0), 10, seed=1))